@@ -1,10 +1,22 @@
 class FeedingModel(object):
-    def __init__(self, id, date, starter_name, jar_name, jar_distance):
+    def __init__(
+        self,
+        id,
+        date,
+        starter_name,
+        jar_name,
+        jar_distance,
+        jar_timing_budget=None,
+        jar_samples=None,
+    ):
         self.id = id
         self.date = date
         self.starter_name = starter_name
         self.jar_name = jar_name
         self.jar_distance = jar_distance
+        # ToF settings tuned for the jar, None when not tuned
+        self.jar_timing_budget = jar_timing_budget
+        self.jar_samples = jar_samples
 
     @classmethod
     def from_dict(cls, dict_):
@@ -19,6 +31,9 @@ class FeedingModel(object):
             dict_["starter_name"][0],
             dict_["jar_name"][0],
             dict_["jar_distance"][0],
+            # Optional lookups, missing when the jar was never tuned
+            (dict_.get("jar_timing_budget") or [None])[0],
+            (dict_.get("jar_samples") or [None])[0],
         )
 
     @classmethod
@@ -1,15 +1,28 @@
 class JarModel(object):
-    def __init__(self, name, distance):
+    def __init__(self, name, distance, timing_budget=None, samples=None):
         self.name = name
         self.distance = distance
+        # ToF settings tuned for this jar, None when not tuned
+        self.timing_budget = timing_budget
+        self.samples = samples
 
     @classmethod
     def from_dict(cls, dict_):
         cls.validate_dict(dict_)
-        return JarModel(dict_["name"], dict_["distance"])
+        return JarModel(
+            dict_["name"],
+            dict_["distance"],
+            dict_.get("timing_budget"),
+            dict_.get("samples"),
+        )
 
     def to_dict(self):
-        return {"name": self.name, "distance": self.distance}
+        dict_ = {"name": self.name, "distance": self.distance}
+        # Only sent when tuned, so tables without these fields keep working
+        if self.timing_budget is not None:
+            dict_["timing_budget"] = self.timing_budget
+            dict_["samples"] = self.samples
+        return dict_
 
     @classmethod
     def validate_dict(self, dict_):
@@ -0,0 +1,20 @@
+# Screens are imported on first use, so a screen's module, fonts and services
+# load when it is first navigated to instead of at boot:
+#   import app.screens as app_screens
+#   Screen.change(app_screens.MainMenuScreen)
+# A `from app.screens import X` at module level imports X right away.
+from app.utils.lazy import load
+
+_attrs = {
+    "SplashScreen": "app.screens.splash",
+    "MainMenuScreen": "app.screens.main_menu",
+    "JarNameScreen": "app.screens.jar_name",
+    "MeasureScreen": "app.screens.jar_measure",
+    "TrackingSelectScreen": "app.screens.tracking_select",
+    "TrackingGrowthScreen": "app.screens.tracking_growth",
+    "SettingsScreen": "app.screens.settings",
+}
+
+
+def __getattr__(attr):
+    return load("app.screens", _attrs, globals(), attr)
@@ -0,0 +1,46 @@
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ucollections import OrderedDict
+
+import config
+from app.services.log import LogServiceManager
+from lib.gui.core.ugui import Screen
+
+# Create logger
+logger = LogServiceManager.get_logger(name=__name__)
+
+
+class ScreenFactory:
+    """Keeps the most recently used screen instances so navigating back to a
+    screen reuses its widget tree instead of building it again.
+
+    Only use it for screens whose content depends on nothing but the cache
+    key. Tasks are still cancelled when a screen is left and `after_open`
+    runs on every visit.
+    """
+
+    def __init__(self, size=None):
+        self._size = config.SCREEN_CACHE_SIZE if size is None else size
+        self._screens = OrderedDict()
+
+    def change(self, cls, mode=Screen.STACK, *, args=(), key=None):
+        """Like `Screen.change`, reusing a cached instance of `cls` created
+        with the same `key` (by default the arguments)."""
+        key = (cls, args if key is None else key)
+        screen = self._screens.pop(key, None)
+        if screen is None:
+            logger.debug(f"Creating {cls.__name__}...")
+            Screen.change(cls, mode, args=args)
+            screen = Screen.current_screen
+        else:
+            Screen.change(screen, mode)
+        self._screens[key] = screen
+        while len(self._screens) > self._size:
+            self._screens.pop(next(iter(self._screens)))
+
+    def clear(self):
+        self._screens.clear()
+
+
+screens = ScreenFactory()
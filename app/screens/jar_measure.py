@@ -4,19 +4,20 @@ from math import ceil
 
 from app.utils.memory import print_mem
 import config
-from hardware_setup import tof_sensor
+import hardware_setup
 from app.services.log import LogServiceManager
-import lib.gui.fonts.freesans20 as large_font
+import lib.gui.fonts.freesans20_num as large_font  # Digits, "%", "-", " " and "m"
 import lib.gui.fonts.arial10 as small_font
 from lib.gui.core.ugui import Screen, ssd
 from lib.gui.widgets.buttons import Button
 from lib.gui.widgets.label import Label
-from lib.gui.core.writer import Writer
+from app.utils.writers import get_writer
 
 from app.widgets.widgets.message_box import MessageBox
 from app.models.jar import JarModel
 from app.utils.decorators import time_it, track_mem
 from app.services.db import DBService
+from app.services.tof_tuning import TofTuner
 from app.utils.filtering import TofDistanceFilter
 
 # Create logger
@@ -29,18 +30,25 @@ class MeasureScreen(Screen):
         self._jar_name = jar_name
         self._distance = 0
         self._db_service = DBService()
-        self._tof_sensor = tof_sensor
+        # Created during boot, read at use time
+        self._tof_sensor = hardware_setup.tof_sensor
 
         self._tof_filter = TofDistanceFilter()
+        self._preview_task = None
 
-        self._large_writer = Writer(ssd, large_font, verbose=False)
-        self._small_writer = Writer(ssd, small_font, verbose=False)
+        self._large_writer = get_writer(large_font)
+        self._small_writer = get_writer(small_font)
 
         # UI Widgets
         # Jar name
         lbl_width = ssd.width
         name_lbl = Label(
-            self._small_writer, row=4, col=0, text=lbl_width, justify=Label.CENTRE
+            self._small_writer,
+            row=4,
+            col=0,
+            text=lbl_width,
+            justify=Label.CENTRE,
+            cache=True,
         )
         name_lbl.value(self._jar_name)
 
@@ -81,7 +89,18 @@ class MeasureScreen(Screen):
         btn_cancel.col = screen_center_h + btn_margin // 2
 
     def after_open(self):
-        asyncio.create_task(self.compute_distance())
+        self._preview_task = asyncio.create_task(self.compute_distance())
+
+    async def stop_preview(self):
+        # The preview must not read the sensor while it is tuned or sampled
+        task = self._preview_task
+        self._preview_task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
     def save_callback(self, btn, arg):
         asyncio.create_task(self.save_async())
@@ -89,32 +108,32 @@ class MeasureScreen(Screen):
     def back_callback(self, button, arg):
         Screen.back()
 
-    def sample_average(self, num_samples):
-        distance = 0
-        for i in range(num_samples):
-            while (
-                not self._tof_sensor.data_ready
-                and not self._tof_sensor.range_status == 0
-            ):
-                logger.debug(
-                    f"Ready: {self._tof_sensor.data_ready} Status: {self._tof_sensor.range_status}"
-                )
-
-            distance += self._tof_sensor.distance
-            self._tof_sensor.clear_interrupt()
-
-        result = distance // num_samples
-        return result
+    async def sample_average(self, max_samples):
+        # Stops as soon as the readings are precise enough
+        distance, stats = await self._tof_sensor.read_average(
+            max_samples, config.TOF_TARGET_ERROR_MM
+        )
+        logger.debug(
+            f"{stats.count} samples ({stats.effective_count:.1f} effective, "
+            f"{stats.rejected} rejected), error {stats.std_error} mm"
+        )
+        if distance is None:
+            return self._distance  # Nothing usable, keep the last value
+        return round(distance)
 
     async def compute_distance(self):
         logger.info("Previewing distance...")
         print_mem()
-        self._tof_sensor.stop_ranging()
-        self._tof_sensor.timing_budget = config.TOF_TIMING_BUDGET
-        self._tof_sensor.start_ranging()
+        self._tof_sensor.set_budget(config.TOF_TIMING_BUDGET)
+        self._tof_sensor.start()
 
         while type(Screen.current_screen) == MeasureScreen:
-            distance = self.sample_average(config.TOF_SAMPLES)
+            try:
+                distance = await self.sample_average(config.TOF_SAMPLES)
+            except OSError as e:
+                logger.error(f"Error reading distance. {e}")
+                await asyncio.sleep(config.PREVIEW_UPDATE_DELAY)
+                continue
             self._distance = self._tof_filter.update(distance)
             self._distance_lbl.value(f"{int(self._distance)} mm")
             await asyncio.sleep(config.PREVIEW_UPDATE_DELAY)
@@ -122,17 +141,23 @@ class MeasureScreen(Screen):
     async def save_async(self):
         logger.info("Saving distance...")
         print_mem()
+        # Tuning and saving need the sensor to themselves.
+        await self.stop_preview()
         # Popup, since saving can take a while.
         await self.show_popup("Saving...")
 
-        # We take 1 high quality sample for saving.
-        self._tof_sensor.stop_ranging()
-        self._tof_sensor.timing_budget = config.TOF_TIMING_BUDGET
-        self._distance = self.sample_average(config.TOF_SAMPLES)
-        self._tof_sensor.start_ranging()
-
         try:
-            model = JarModel(self._jar_name, self._distance)
+            timing_budget = samples = None
+            if config.TOF_AUTO_TUNE:
+                # Pick the cheapest settings for this jar, saved with it.
+                timing_budget, samples = await TofTuner(self._tof_sensor).tune()
+
+            # We take 1 high quality sample for saving.
+            self._tof_sensor.set_budget(timing_budget or config.TOF_TIMING_BUDGET)
+            self._tof_sensor.start()
+            self._distance = await self.sample_average(samples or config.TOF_SAMPLES)
+
+            model = JarModel(self._jar_name, self._distance, timing_budget, samples)
             self._db_service.create_jar(model)
 
             Screen.back()  # Close the popup
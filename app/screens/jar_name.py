@@ -1,12 +1,12 @@
 import random
 
-from app.screens.jar_measure import MeasureScreen
+import app.screens as app_screens
 from app.services.log import LogServiceManager
 from app.utils import memory
 import config
 from lib.gui.core.ugui import Screen, ssd
 from lib.gui.widgets.buttons import Button
-from lib.gui.core.writer import Writer
+from app.utils.writers import get_writer
 import lib.gui.fonts.arial10 as small_font
 
 from app.resources.names import NAMES
@@ -19,7 +19,7 @@ logger = LogServiceManager.get_logger(name=__name__)
 class JarNameScreen(Screen):
     def __init__(self):
         super().__init__()
-        writer = Writer(ssd, small_font, verbose=False)
+        writer = get_writer(small_font)
 
         # UI Widgets
         # Title
@@ -32,6 +32,7 @@ class JarNameScreen(Screen):
             col=0,
             text=ssd.width,
             justify=Label.CENTRE,
+            cache=True,
         )
         lbl.value("Select a name")
 
@@ -65,4 +66,4 @@ class JarNameScreen(Screen):
 
     def select_name(self, button, arg):
         logger.info(f"Name selected: {arg}")
-        Screen.change(MeasureScreen, mode=Screen.REPLACE, args=[arg])
+        Screen.change(app_screens.MeasureScreen, mode=Screen.REPLACE, args=[arg])
@@ -1,15 +1,13 @@
 import asyncio
-from app.screens.jar_name import JarNameScreen
-from app.screens.settings import SettingsScreen
-from app.screens.tracking_select import TrackingSelectScreen
-from app.services.db import DBService
+import app.screens as app_screens
+import app.services as app_services
+from app.screens.factory import screens
 from app.services.log import LogServiceManager
 from app.utils import memory
+from app.utils.writers import get_writer
 from app.widgets.widgets.message_box import MessageBox
 import config
 from lib.gui.core.ugui import Screen, ssd
-
-from lib.gui.core.writer import Writer
 import lib.gui.fonts.arial10 as arial10
 from lib.gui.widgets.buttons import Button
 
@@ -24,8 +22,8 @@ class MainMenuScreen(Screen):
 
     def __init__(self):
         super().__init__()
-        self._db_service = DBService()
-        self._writer = Writer(ssd, arial10, verbose=False)
+        self._db_service = None  # Created on first use, loads urequests
+        self._writer = get_writer(arial10)
 
         # UI widgets
         btn_width = int(ssd.width / 1.5)
@@ -90,6 +88,8 @@ class MainMenuScreen(Screen):
 
         try:
             memory.print_mem()
+            if self._db_service is None:
+                self._db_service = app_services.DBService()
             feedings = self._db_service.get_feedings(config.MAX_FEEDINGS)
             if not len(feedings):
                 logger.warning("No feedings found.")
@@ -97,17 +97,22 @@ class MainMenuScreen(Screen):
                 await self.show_popup("No feedings found.", duration=1)
             else:
                 Screen.back()  # Close the popup
-                Screen.change(TrackingSelectScreen, args=(feedings,))
+                # Same feedings as last time: reuse the screen.
+                screens.change(
+                    app_screens.TrackingSelectScreen,
+                    args=(feedings,),
+                    key=tuple(feeding.id for feeding in feedings),
+                )
         except Exception as e:
             logger.error(f"Error retrieving feeds. {e}")
             Screen.back()  # Close the popup
 
     def navigate(self, button, arg):
         if arg == MainMenuScreen.NAV_JAR_NAME:
-            Screen.change(JarNameScreen)
+            Screen.change(app_screens.JarNameScreen)
         elif arg == MainMenuScreen.NAV_TRACKING_SELECT:
             # Tracking needs to load the feedings from the DB.
             # We run it async since we need to update the UI
             asyncio.create_task(self.navigate_tracking())
         elif arg == MainMenuScreen.NAV_SETTINGS:
-            Screen.change(SettingsScreen)
+            screens.change(app_screens.SettingsScreen)
@@ -2,8 +2,7 @@ import os
 import machine
 from app.services.log import LogServiceManager
 from lib.gui.core.ugui import Screen, ssd
-
-from lib.gui.core.writer import Writer
+from app.utils.writers import get_writer
 import lib.gui.fonts.arial10 as arial10
 from lib.gui.widgets.buttons import Button
 
@@ -13,7 +12,7 @@ logger = LogServiceManager.get_logger(name=__name__)
 
 class SettingsScreen(Screen):
     def __init__(self):
-        writer = Writer(ssd, arial10)
+        writer = get_writer(arial10)
         super().__init__()
 
         btn_width = int(ssd.width / 1.5)
@@ -2,16 +2,17 @@ import asyncio
 import gc
 import sys
 
-from app.screens.main_menu import MainMenuScreen
+import hardware_setup
+import app.screens as app_screens
 from app.services.log import LogServiceManager
-from app.services.network import NetworkService
-from app.utils import memory
+from app.services.network import get_network_service
+from app.utils import boot, memory
 from app.utils.time import init_time
 from lib.gui.core.colors import BLACK, WHITE
 from lib.gui.core.ugui import Screen, ssd
 from lib.gui.widgets.bitmap import BitMap
 from lib.gui.widgets.label import Label
-from lib.gui.core.writer import Writer
+from app.utils.writers import get_writer
 import lib.gui.fonts.arial10 as arial10
 import config
 
@@ -21,12 +22,12 @@ logger = LogServiceManager.get_logger(name=__name__)
 
 class SplashScreen(Screen):
     def __init__(self):
-        writer = Writer(ssd, arial10, verbose=False)
+        writer = get_writer(arial10)
         super().__init__(writer)
 
-        self._next_screen = MainMenuScreen
+        self._next_screen = "MainMenuScreen"  # Imported once boot is done
         self._delay = config.SPLASH_DELAY
-        self._net_service = NetworkService()
+        self._net_service = get_network_service()
 
         # UI widgets
         # Logo
@@ -44,7 +45,7 @@ class SplashScreen(Screen):
             bgcolor=WHITE,
             bdcolor=None,
         )
-        self.graphic.value(path := "fermento_logo.xbm")
+        self.graphic.value(path := "fermento_logo.mbm")
 
         # Progress messages
         self._lbl_msg = Label(
@@ -59,37 +60,66 @@ class SplashScreen(Screen):
         asyncio.create_task(self.initialize())
 
     async def initialize(self):
-        logger.info("Initializing WiFi...")
+        # Boot graph: the sensors come up while WiFi associates and the clock
+        # is set, the menu opens once both branches are done.
+        boot.set_listener(self._lbl_msg.value)
+        sensors = asyncio.create_task(self.init_sensors())
+
+        if not await self.init_network():
+            # Start the web server for the user to connect to and enter
+            # credentials.
+            await self.display_message_async("Configure WiFi")
+            logger.info("Starting web server...")
+            try:
+                # The portal runs on the event loop, the screen stays live
+                # and shows the portal status.
+                await self._net_service.start_server(self._lbl_msg.value)
+            except Exception as e:
+                logger.critical(f"Error starting web server. {e}")
+                sys.exit()
+            return
+
+        await sensors
+        await self.display_message_async("Welcome")
+        # Load the menu while the welcome message shows
+        next_screen = getattr(app_screens, self._next_screen)
+        boot.stage("Ready")
+        boot.set_listener(None)
+        boot.report()
+        await asyncio.sleep(self._delay)
+        Screen.change(next_screen)
+
+    async def init_sensors(self):
+        try:
+            await hardware_setup.init_sensors()
+        except Exception as e:
+            logger.critical(f"Error creating sensors. {e}")
+            sys.exit()
 
-        # Connect ti wifi or start the web server for the
-        # user to connect to and enter credentials.
+    async def init_network(self):
+        logger.info("Initializing WiFi...")
         gc.collect()
         memory.print_mem()
 
-        connected = None
         await self.display_message_async("Connecting")
         try:
-            connected = self._net_service.connect()
+            connected = await self._net_service.connect()
         except Exception as e:
             logger.critical(f"Error connecting to WiFi. {e}")
             sys.exit()
+        if not connected:
+            return False
+        boot.stage("WiFi connected")
 
-        if connected:
-            logger.info("Setting up...")
-            await self.display_message_async("Setting up")
-            await asyncio.sleep(1)  # Give WiFi some time to initialize
+        # Keep the link up from now on, reconnecting if it drops
+        self._net_service.start()
+        logger.info("Setting up...")
+        if not init_time():
+            # DNS may lag the association, one more try
+            await asyncio.sleep(1)
             init_time()
-            await self.display_message_async("Welcome")
-            await asyncio.sleep(self._delay)
-            Screen.change(self._next_screen)
-        else:
-            await self.display_message_async("Configure WiFi")
-            logger.info("Starting web server...")
-            try:
-                self._net_service.start_server()
-            except Exception as e:
-                logger.critical(f"Error starting web server. {e}")
-                sys.exit()
+        boot.stage("Clock set")
+        return True
 
     async def display_message_async(self, msg):
         self._lbl_msg.value(msg)
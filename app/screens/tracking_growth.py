@@ -5,39 +5,69 @@ import time
 from app.models.feeding_progress import FeedingProgressModel
 from app.services.log import LogServiceManager
 from app.utils import memory
-from app.utils.filtering import TofDistanceFilter
 from app.services.db import DBService
+from app.services.network import get_network_service
+from app.services.sensor_power import SensorPowerPolicy
 import config
 from drivers import sht4x
-from hardware_setup import tof_sensor, sdc41, sht40
+import hardware_setup
 
-import lib.gui.fonts.freesans20 as large_font
+import lib.gui.fonts.freesans20_num as large_font  # Digits, "%", "-", " " and "m"
 import lib.gui.fonts.arial10 as small_font
 from lib.gui.core.colors import BLACK, WHITE
 from lib.gui.core.ugui import Screen, ssd
 from lib.gui.widgets.buttons import Button
 from lib.gui.widgets.label import Label
-from lib.gui.core.writer import Writer
+from app.utils.writers import get_writer
+from app.widgets.widgets.sparkline import Sparkline
 
 
 # Create logger
 logger = LogServiceManager.get_logger(name=__name__)
 
+# Time covered by the growth sparkline before it starts scrolling.
+SPARKLINE_SPAN = 24 * 3600
+
+
+class JarTracker:
+    """Growth state of one jar, fed by its slot in the ToF array."""
+
+    def __init__(self, feeding, slot):
+        self.feeding = feeding
+        self.slot = slot
+        self.starting_distance = None
+        self.current_distance = 0
+        self.growth_percent = 0
+
+    def update(self, started):
+        self.current_distance = self.slot.distance
+        # Once start is pressed, we record the starting distance.
+        if started and self.starting_distance is None:
+            self.starting_distance = self.current_distance
+
+    def compute_growth(self):
+        initial_size = self.feeding.jar_distance - self.starting_distance
+        growth_size = self.starting_distance - self.current_distance
+        try:
+            self.growth_percent = growth_size / initial_size * 100.0
+        except ZeroDivisionError:
+            self.growth_percent = 0
+        return self.growth_percent
+
 
 class TrackingGrowthScreen(Screen):
     STATE_STOPPED = 0
     STATE_STARTED = 1
 
-    def __init__(self, feeding_id, starter_name, jar_name, jar_distance):
-        logger.debug(
-            f"Received feeding:{feeding_id} starter:{starter_name} jar:{jar_name} jar height:{jar_distance}"
-        )
-        self._feeding_id = feeding_id
-        self._starter_name = starter_name
-        self._jar_name = jar_name
-        self._jar_distance = jar_distance
-        self._starting_distance = None
-        self._current_distance = 0
+    def __init__(self, feedings):
+        # One feeding per sensor in the array, extra feedings are ignored.
+        # Sensors are created during boot, read them at use time
+        tof_array = hardware_setup.tof_array
+        feedings = feedings[: len(tof_array)]
+        for feeding in feedings:
+            logger.debug(
+                f"Received feeding:{feeding.id} starter:{feeding.starter_name} jar:{feeding.jar_name} jar height:{feeding.jar_distance}"
+            )
         self._temperature = 0
         self._rh = 0
         self._co2 = 0
@@ -50,19 +80,26 @@ class TrackingGrowthScreen(Screen):
         self._run_task = None
 
         self._db_service = DBService()
-        self._tof_sensor = tof_sensor
-        self._scd41_sensor = sdc41
-        self._sht40 = sht40
-
-        self._tof_filter = TofDistanceFilter()
-
-        self._large_writer = Writer(ssd, large_font, verbose=False)
-        self._small_writer = Writer(ssd, small_font, verbose=False)
+        self._network = get_network_service()
+        self._tof_array = tof_array
+        self._scd41_sensor = hardware_setup.sdc41
+        self._scd41_policy = SensorPowerPolicy(hardware_setup.sdc41)
+        self._sht40 = hardware_setup.sht40
+
+        self._trackers = [
+            JarTracker(feeding, slot) for feeding, slot in zip(feedings, tof_array.slots)
+        ]
+        # Jar shown on screen, rotates every update when tracking several jars.
+        self._shown = 0
+
+        self._large_writer = get_writer(large_font)
+        self._small_writer = get_writer(small_font)
         super().__init__()
 
         # UI widgets
         # Bottom left (temperature)
         row = ssd.height - self._small_writer.height - 2
+        bottom_row = row
         width = ssd.width // 3
         self._temperature_lbl = Label(
             self._small_writer, row=row, col=2, text=width, justify=Label.LEFT
@@ -95,6 +132,23 @@ class TrackingGrowthScreen(Screen):
         )
         self._growth_lbl.value("0%")
 
+        # Growth curve of the selected jar, under the growth label and left of
+        # the start/stop button, above the bottom row
+        width = ssd.width // 2 - 4
+        spark_row = row + self._large_writer.height + 2
+        height = bottom_row - 1 - spark_row
+        samples = int(SPARKLINE_SPAN // config.LIVE_UPDATE_DELAY)
+        self._sparkline = Sparkline(
+            self._small_writer,
+            row=spark_row,
+            col=2,
+            width=width,
+            height=height,
+            lo=0,
+            hi=100,
+            max_bin=max(1, -(-samples // width)),  # Ceiling division
+        )
+
         # Center right (start/stop)
         width = ssd.width // 2 - 8
         height = self._small_writer.height + 8
@@ -113,9 +167,14 @@ class TrackingGrowthScreen(Screen):
         width = ssd.width // 3
         row = 2
         self._starter_lbl = Label(
-            self._small_writer, row=row, col=2, text=width, justify=Label.LEFT
+            self._small_writer,
+            row=row,
+            col=2,
+            text=width,
+            justify=Label.LEFT,
+            cache=True,
         )
-        self._starter_lbl.value(self._starter_name)
+        self._starter_lbl.value(self._trackers[0].feeding.starter_name)
 
         # Top center  (time elapsed)
         col = ssd.width // 3
@@ -127,15 +186,39 @@ class TrackingGrowthScreen(Screen):
         # Top right (jar name)
         col = ssd.width // 3 * 2
         self._jar_lbl = Label(
-            self._small_writer, row=row, col=col, text=width, justify=Label.RIGHT
+            self._small_writer,
+            row=row,
+            col=col,
+            text=width,
+            justify=Label.RIGHT,
+            cache=True,
         )
-        self._jar_lbl.value(self._jar_name)
+        self._jar_lbl.value(self._trackers[0].feeding.jar_name)
 
     def after_open(self):
-        self.init_sensors()
-        self.start_sensors()
         self._run_task = asyncio.create_task(self.run())
 
+    def on_hide(self):
+        # Leaving the screen other than with the stop button
+        if self._run_task is not None:
+            asyncio.create_task(self.shutdown())
+
+    async def stop_run(self):
+        task = self._run_task
+        self._run_task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def shutdown(self):
+        # The run loop must be gone before the sensors it polls are stopped
+        self.stop_timer()
+        await self.stop_run()
+        await self.stop_sensors()
+
     def start_stop_callback(self, btn):
         asyncio.create_task(self.start_stop_async())
 
@@ -154,33 +237,40 @@ class TrackingGrowthScreen(Screen):
             logger.debug("Changing state to STOPPED")
             self._state = TrackingGrowthScreen.STATE_STOPPED
 
-            self.stop_timer()
-            self.stop_sensors()
+            await self.shutdown()
 
             self._btn.text = "Start"
             self._btn.show()
             await asyncio.sleep(0.1)
             Screen.back()
 
-    def init_sensors(self):
+    async def init_sensors(self):
         logger.info("Initializing sensors...")
-        self.stop_sensors()
+        await self.stop_sensors()
 
         self._tof_samples = config.TOF_SAMPLES
-        self._tof_sensor.timing_budget = config.TOF_TIMING_BUDGET
-        self._tof_sensor.inter_measurement = 0
+        self._tof_array.configure(config.TOF_TIMING_BUDGET)
+        # Sensors without a jar to track stay idle
+        self._tof_array.activate(len(self._trackers))
+        for tracker in self._trackers:
+            feeding = tracker.feeding
+            if feeding.jar_timing_budget:
+                # Settings tuned when the jar was measured
+                self._tof_array.configure_slot(
+                    tracker.slot.index, feeding.jar_timing_budget, feeding.jar_samples
+                )
 
-        self._scd41_sensor.mode = sht4x.Mode.NOHEAT_HIGHPRECISION
+        self._sht40.mode = sht4x.Mode.NOHEAT_HIGHPRECISION
 
-    def start_sensors(self):
+    async def start_sensors(self):
         logger.info("Starting sensors...")
-        self._tof_sensor.start_ranging()
-        self._scd41_sensor.start_periodic_measurement()
+        self._tof_array.start()
+        await self._scd41_policy.start()
 
-    def stop_sensors(self):
+    async def stop_sensors(self):
         logger.info("Stopping sensors...")
-        self._tof_sensor.stop_ranging()
-        self._scd41_sensor.stop_periodic_measurement()
+        self._tof_array.stop()
+        await self._scd41_policy.stop()
 
     def start_timer(self):
         logger.info("Starting timer...")
@@ -192,13 +282,19 @@ class TrackingGrowthScreen(Screen):
             self._timer_task.cancel()
 
     async def run(self):
+        # Sensor start up awaits the SCD4X command delays, so the screen is
+        # drawn and responsive while the sensors settle.
+        await self.init_sensors()
+        await self.start_sensors()
+
         logger.info("Tracking...")
         while True:
             if self._state == TrackingGrowthScreen.STATE_STARTED:
                 logger.info("(STARTED) Gathering sensor data...")
-                self.compute_environment()
-                self.compute_distance()
+                await self.compute_environment()
+                await self.compute_distance()
                 self.compute_growth()
+                self.show_jar()
 
                 logger.info("Submitting data...")
                 gc.collect()
@@ -207,17 +303,20 @@ class TrackingGrowthScreen(Screen):
 
             elif self._state == TrackingGrowthScreen.STATE_STOPPED:
                 logger.info("(STOPPED) Gathering sensor data...")
-                self.compute_environment()
-                self.compute_distance()
+                await self.compute_environment()
+                await self.compute_distance()
+                self.show_jar()
                 await asyncio.sleep(config.PREVIEW_UPDATE_DELAY)
 
-    def compute_environment(self):
-        if self._scd41_sensor.data_ready:
-            logger.info("Gathering CO2 data...")
-            self._co2 = self._scd41_sensor.CO2
-
+    async def compute_environment(self):
         logger.info("Gathering temp/rh data...")
         self._temperature, self._rh = self._sht40.measurements
+        self._scd41_policy.compensate(self._temperature)
+
+        logger.info("Gathering CO2 data...")
+        reading = await self._scd41_policy.read()
+        if reading is not None:
+            self._co2 = reading[0]
 
         logger.info(f"T:{self._temperature:.1f}C RH:{self._rh:.1f}% CO2:{self._co2}ppm")
 
@@ -225,48 +324,33 @@ class TrackingGrowthScreen(Screen):
         self._rh_lbl.value(f"{self._rh:.1f}%")
         self._co2_lbl.value(f"{self._co2}ppm")
 
-    def sample_average_distance(self, num_samples):
-        distance = 0
-        for i in range(num_samples):
-            while (
-                not self._tof_sensor.data_ready
-                and not self._tof_sensor.range_status == 0
-            ):
-                logger.debug(
-                    f"Ready: {self._tof_sensor.data_ready} Status: {self._tof_sensor.range_status}"
-                )
-
-            distance += self._tof_sensor.distance
-            self._tof_sensor.clear_interrupt()
-
-        result = distance // num_samples
-        return result
-
-    def compute_distance(self):
+    async def compute_distance(self):
         logger.info("Gathering distance...")
-        raw_distance = self.sample_average_distance(self._tof_samples)
-        distance = self._tof_filter.update(raw_distance)
-        self._current_distance = distance
-
-        # Once start is pressed, we record the starting distance.
-        if (
-            self._state == TrackingGrowthScreen.STATE_STARTED
-            and self._starting_distance is None
-        ):
-            self._starting_distance = self._current_distance
+        # All jars are sampled together, the array interleaves the sensors.
+        await self._tof_array.sample(self._tof_samples, config.TOF_TARGET_ERROR_MM)
+        started = self._state == TrackingGrowthScreen.STATE_STARTED
+        for tracker in self._trackers:
+            tracker.update(started)
 
     def compute_growth(self):
         logger.info("Computing growth...")
-        initial_size = self._jar_distance - self._starting_distance
-        growth_size = self._starting_distance - self._current_distance
-        print(f"initial size {initial_size} growth size {growth_size}")
-        try:
-            growth_percent = growth_size / initial_size * 100.0
-        except ZeroDivisionError:
-            growth_percent = 0
-
-        self._growth_lbl.value(f"{int(growth_percent)}%")
-        logger.info(f"Growth: {growth_percent}")
+        for tracker in self._trackers:
+            growth_percent = tracker.compute_growth()
+            logger.info(
+                f"Growth {tracker.feeding.jar_name}: {growth_percent} "
+                f"rise: {tracker.slot.rise_rate:.1f}mm/h"
+            )
+        self._sparkline.add(self._trackers[0].growth_percent)
+
+    def show_jar(self):
+        # Cycle through the jars, one per update.
+        tracker = self._trackers[self._shown]
+        self._shown = (self._shown + 1) % len(self._trackers)
+        if len(self._trackers) > 1:
+            self._starter_lbl.value(tracker.feeding.starter_name)
+            self._jar_lbl.value(tracker.feeding.jar_name)
+        if self._state == TrackingGrowthScreen.STATE_STARTED:
+            self._growth_lbl.value(f"{int(tracker.growth_percent)}%")
 
     async def update_time(self):
         elapsed_seconds = 0
@@ -278,21 +362,23 @@ class TrackingGrowthScreen(Screen):
             await asyncio.sleep(1)
 
     def submit_data(self):
-        model = FeedingProgressModel(
-            self._feeding_id,
-            self._temperature,
-            self._rh / 100,
-            self._co2,
-            self._starting_distance,
-            self._current_distance,
-        )
-        logger.info(
-            f"Submitting data: feeding: {self._feeding_id} T: {self._temperature} RH: {self._rh}% "
-        )
-        logger.info(f"CO2: {self._co2}ppm")
-        logger.info(
-            f"starting distance:{self._starting_distance} cur distance: {self._current_distance}"
-        )
-
         memory.print_mem()
-        self._db_service.create_feeding_progress(model)
+        for tracker in self._trackers:
+            model = FeedingProgressModel(
+                tracker.feeding.id,
+                self._temperature,
+                self._rh / 100,
+                self._co2,
+                None,  # No gas sensor fitted
+                tracker.starting_distance,
+                tracker.current_distance,
+            )
+            logger.info(
+                f"Submitting data: feeding: {tracker.feeding.id} T: {self._temperature} RH: {self._rh}% "
+            )
+            logger.info(f"CO2: {self._co2}ppm")
+            logger.info(
+                f"starting distance:{tracker.starting_distance} cur distance: {tracker.current_distance}"
+            )
+            # Sent in the background once online, never blocks sampling
+            self._network.queue_upload(self._db_service.create_feeding_progress, model)
@@ -1,10 +1,11 @@
-from app.screens.tracking_growth import TrackingGrowthScreen
+import app.screens as app_screens
 from app.services.log import LogServiceManager
 from app.utils import memory
 from app.utils.decorators import time_it
+import hardware_setup
 from lib.gui.core.ugui import Screen, ssd
 from lib.gui.widgets.buttons import Button
-from lib.gui.core.writer import Writer
+from app.utils.writers import get_writer
 import lib.gui.fonts.arial10 as small_font
 
 from app.resources.names import NAMES
@@ -16,22 +17,49 @@ logger = LogServiceManager.get_logger(name=__name__)
 
 
 class TrackingSelectScreen(Screen):
-    def __init__(self, feedings):
+    """Picks the feeding watched by each ToF sensor, one screen per sensor.
+
+    `selected` holds the feedings already given to the sensors before this
+    one. Tracking starts once every sensor has a feeding, when no feedings
+    are left or with the Start button, the sensors left without one stay
+    idle.
+    """
+
+    def __init__(self, feedings, selected=()):
         super().__init__()
-        self._writer = Writer(ssd, small_font, verbose=False)
+        self._feedings = feedings
+        self._selected = list(selected)
+        self._sensors = len(hardware_setup.tof_array)
+        self._writer = get_writer(small_font)
 
         # UI widgets
         # Title label
         row = 6
         col = 0
-        lbl = Label(
-            self._writer,
-            row=row,
-            col=col,
-            text=ssd.width,
-            justify=Label.CENTRE,
-        )
-        lbl.value("Select a feeding")
+        if self._sensors == 1:
+            lbl = Label(
+                self._writer,
+                row=row,
+                col=col,
+                text=ssd.width,
+                justify=Label.CENTRE,
+                cache=True,
+            )
+            lbl.value("Select a feeding")
+        else:
+            lbl = Label(self._writer, row=row, col=col + 4, text=ssd.width // 2)
+            lbl.value(f"Jar {len(self._selected) + 1}/{self._sensors}")
+            if self._selected:
+                # Start with the jars picked so far
+                Button(
+                    self._writer,
+                    row=row - 4,
+                    col=ssd.width // 2 + 12,
+                    width=ssd.width // 2 - 24,
+                    height=self._writer.height + 6,
+                    text="Start",
+                    callback=self.start,
+                )
 
         # Feeding buttons
         width = ssd.width - 24
@@ -39,7 +67,9 @@ class TrackingSelectScreen(Screen):
         row = row + self._writer.height + 6
         col = 12
 
-        for i, item in enumerate(feedings):
+        for item in feedings:
+            if item in self._selected:
+                continue
             Button(
                 self._writer,
                 row=row,
@@ -56,10 +86,26 @@ class TrackingSelectScreen(Screen):
         logger.info(
             f"Selected id:{arg.id} date:{arg.date} starter:{arg.starter_name}  jar:{arg.jar_name} distance:{arg.jar_distance}"
         )
+        selected = self._selected + [arg]
+        if len(selected) < min(self._sensors, len(self._feedings)):
+            # Next sensor
+            Screen.change(
+                TrackingSelectScreen,
+                mode=Screen.REPLACE,
+                args=[self._feedings, selected],
+            )
+        else:
+            self.track(selected)
+
+    def start(self, btn):
+        self.track(self._selected)
+
+    def track(self, selected):
+        # The feedings go to the sensors in the order they were picked.
         # We set the mode to replace so that when we go back, it takes us back
         #  to the main menu.
         Screen.change(
-            TrackingGrowthScreen,
+            app_screens.TrackingGrowthScreen,
             mode=Screen.REPLACE,
-            args=[arg.id, arg.starter_name, arg.jar_name, arg.jar_distance],
+            args=[selected],
         )
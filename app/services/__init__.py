@@ -0,0 +1,17 @@
+# Heavy services are imported on first use, see app/screens/__init__.py.
+_attrs = {
+    "DBService": "app.services.db",
+    "NetworkService": "app.services.network",
+    "get_network_service": "app.services.network",
+    "SensorPowerPolicy": "app.services.sensor_power",
+    "TofArray": "app.services.tof_array",
+    "TofTuner": "app.services.tof_tuning",
+}
+
+
+def __getattr__(attr):
+    # Imported here, this package is loaded before logging is set up and the
+    # loader creates a logger.
+    from app.utils.lazy import load
+
+    return load("app.services", _attrs, globals(), attr)
@@ -16,6 +16,9 @@ logger = LogServiceManager.get_logger(name=__name__)
 
 
 class DBService(object):
+    # Socket timeout for queued uploads in seconds, they block the event loop
+    UPLOAD_TIMEOUT = 5
+
     def __init__(self):
         pass
 
@@ -68,16 +71,14 @@ class DBService(object):
         return models
 
     @time_it
-    def create_feeding_progress(self, model, retries=3):
+    def create_feeding_progress(self, model):
+        # Raises OSError on network errors, NetworkService.queue_upload retries
         headers = self._get_headers()
         url = self._get_url(config.TABLE_FEEDINGS_PROGRESS)
         data = {"fields": model.to_dict()}
 
-        try:
-            gc.collect()
-            response = urequests.post(url, headers=headers, json=data)
-        except OSError as e:
-            logger.error(f"Error posting progress: {e}")
-            if retries > 0:
-                logger.info(f"Retries: {retries}")
-                self.create_feeding_progress(model, retries=retries - 1)
+        gc.collect()
+        response = urequests.post(
+            url, headers=headers, json=data, timeout=self.UPLOAD_TIMEOUT
+        )
+        response.close()
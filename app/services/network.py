@@ -1,3 +1,6 @@
+import asyncio
+import random
+
 from app.services.log import LogServiceManager
 from app.services.web.wifi_manager import WifiManager
 
@@ -8,13 +11,161 @@ logger = LogServiceManager.get_logger(name=__name__)
 
 
 class NetworkService:
+    """Owns the Wi-Fi link and the uploads that need it.
+
+    Once started, a supervisor task checks the link and reconnects when it
+    drops, backing off exponentially with jitter between attempts. `online`
+    is an event set while the link is up, so tasks can await it instead of
+    failing requests. Uploads are queued and sent by a drainer task that
+    waits while offline and retries failed uploads with its own backoff,
+    callers never block on the network.
+
+    Reconnecting never scans, see WifiManager.connect, so the supervisor
+    does not stall the event loop. Uploads still do, they are blocking
+    requests. Each socket operation is bounded by DBService.UPLOAD_TIMEOUT,
+    so the worst case is that timeout per stalled operation (connect, send,
+    reply) plus the DNS lookup, which has no timeout of its own.
+    """
+
+    # Seconds between link checks while online
+    CHECK_INTERVAL = 10
+    # Reconnect and upload retry delays, seconds
+    BACKOFF_MIN = 2
+    BACKOFF_MAX = 300
+    # Pending uploads kept while offline, the oldest are dropped beyond this
+    UPLOAD_QUEUE_SIZE = 32
+
     def __init__(self):
         self._wm = WifiManager(
             ssid=config.WIFI_SSID, password=config.WIFI_PASS, reboot=True
         )
+        self.online = asyncio.Event()
+        self._link_lost = asyncio.Event()
+        self._uploads = []
+        self._upload_event = asyncio.Event()
+        self._supervisor_task = None
+        self._drainer_task = None
+
+    async def start_server(self, status=None):
+        await self._wm.web_server(status)
+
+    async def connect(self):
+        connected = await self._wm.connect()
+        if connected:
+            self.online.set()
+        return connected
+
+    def is_online(self):
+        return self.online.is_set()
+
+    async def wait_online(self):
+        await self.online.wait()
+
+    def start(self):
+        """Start supervising the link and draining uploads."""
+        if self._supervisor_task is None:
+            self._supervisor_task = asyncio.create_task(self._supervise())
+            self._drainer_task = asyncio.create_task(self._drain())
+
+    def stop(self):
+        for task in (self._supervisor_task, self._drainer_task):
+            if task:
+                task.cancel()
+        self._supervisor_task = self._drainer_task = None
+
+    def link_lost(self):
+        """Report a network failure, the supervisor checks the link now
+        instead of at its next interval."""
+        self._link_lost.set()
+
+    def queue_upload(self, upload, *args):
+        """Call `upload(*args)` once online. `upload` is a blocking request
+        raising OSError on network failures, it is retried until it succeeds.
+        Any other exception drops it."""
+        if len(self._uploads) >= self.UPLOAD_QUEUE_SIZE:
+            self._uploads.pop(0)
+            logger.warning("Upload queue full, dropping the oldest upload")
+        self._uploads.append((upload, args))
+        self._upload_event.set()
+
+    @property
+    def pending_uploads(self):
+        return len(self._uploads)
+
+    def _jitter(self, delay):
+        # Spread retries between half and one and a half times the delay
+        return delay * (0.5 + random.random())
+
+    async def _wait_link_lost(self, timeout):
+        try:
+            await asyncio.wait_for(self._link_lost.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._link_lost.clear()
+
+    async def _supervise(self):
+        backoff = self.BACKOFF_MIN
+        while True:
+            if self._wm.is_connected():
+                self.online.set()
+                backoff = self.BACKOFF_MIN
+                await self._wait_link_lost(self.CHECK_INTERVAL)
+                continue
+
+            if self.online.is_set():
+                logger.warning("WiFi link lost")
+                self.online.clear()
+
+            logger.info("Reconnecting to WiFi...")
+            try:
+                connected = await self._wm.connect(rescan=False)
+            except Exception as e:
+                logger.error(f"Error reconnecting to WiFi. {e}")
+                connected = False
+            if connected:
+                logger.info("WiFi reconnected")
+                continue
+
+            delay = self._jitter(backoff)
+            logger.info(f"WiFi reconnect failed, next attempt in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, self.BACKOFF_MAX)
+
+    async def _drain(self):
+        backoff = self.BACKOFF_MIN
+        while True:
+            if not self._uploads:
+                self._upload_event.clear()
+                await self._upload_event.wait()
+                continue
+            await self.online.wait()
+
+            upload, args = self._uploads[0]
+            try:
+                upload(*args)
+            except OSError as e:
+                # Keep it queued. The link may be up with the internet down,
+                # so back off here too rather than rely on the supervisor.
+                delay = self._jitter(backoff)
+                logger.error(f"Upload failed, retrying in {delay:.0f}s. {e}")
+                self.link_lost()
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, self.BACKOFF_MAX)
+                continue
+            except Exception as e:
+                logger.error(f"Upload failed, dropping it. {e}")
+
+            self._uploads.pop(0)
+            backoff = self.BACKOFF_MIN
+            await asyncio.sleep_ms(0)
+
+
+_network_service = None
 
-    def start_server(self):
-        self._wm.web_server()
 
-    def connect(self):
-        return self._wm.connect()
+def get_network_service():
+    """Return the shared NetworkService, creating it on first use."""
+    global _network_service
+    if _network_service is None:
+        _network_service = NetworkService()
+    return _network_service
@@ -0,0 +1,150 @@
+import asyncio
+from time import ticks_diff, ticks_ms
+
+from app.services.log import LogServiceManager
+import config
+
+# Create logger
+logger = LogServiceManager.get_logger(name=__name__)
+
+
+class SensorPowerPolicy:
+    """Chooses how the SCD4X measures based on how often data is consumed.
+
+    The SCD4X draws ~15mA in periodic mode (a sample every 5s). When data is
+    only uploaded every few minutes most of those samples are thrown away, so
+    slower intervals use low power periodic mode (a sample every 30s) or
+    on-demand single shots, and the sensor sits idle in between.
+
+    With a reference temperature (`compensate`) the SCD4X temperature offset
+    follows its self heating. Single shots pick up a new offset before the
+    next shot, periodic modes are stopped and restarted to write it, which
+    costs one sample.
+    """
+
+    MODE_PERIODIC = 0
+    MODE_LOW_POWER = 1
+    MODE_SINGLE_SHOT = 2
+
+    MODE_NAMES = {
+        MODE_PERIODIC: "periodic",
+        MODE_LOW_POWER: "low power periodic",
+        MODE_SINGLE_SHOT: "single shot",
+    }
+
+    # Max temperature offset the SCD4X accepts without overflowing its self
+    # heating compensation. Larger differences mean the reference is wrong.
+    MAX_TEMPERATURE_OFFSET = 20.0
+
+    def __init__(self, scd4x, interval=None, ambient_pressure=None):
+        self._scd4x = scd4x
+        self._interval = config.LIVE_UPDATE_DELAY if interval is None else interval
+        self._ambient_pressure = (
+            config.SCD4X_AMBIENT_PRESSURE if ambient_pressure is None else ambient_pressure
+        )
+        self.mode = self.select_mode(self._interval)
+
+        self._shot_task = None
+        self._last_shot = None
+        self._reference_temperature = None
+        self._temperature_offset = None
+        self._pending_offset = None
+        logger.info(
+            f"SCD4X mode: {self.MODE_NAMES[self.mode]} (interval {self._interval}s)"
+        )
+
+    @classmethod
+    def select_mode(cls, interval):
+        if interval < config.SCD4X_LOW_POWER_INTERVAL:
+            return cls.MODE_PERIODIC
+        if interval < config.SCD4X_SINGLE_SHOT_INTERVAL:
+            return cls.MODE_LOW_POWER
+        return cls.MODE_SINGLE_SHOT
+
+    async def start(self):
+        # Settings can only be read and written while the sensor is idle.
+        if self._temperature_offset is None:
+            self._temperature_offset = self._scd4x.temperature_offset
+        self._apply_temperature_offset()
+        if self._ambient_pressure:
+            self._scd4x.set_ambient_pressure(self._ambient_pressure)
+
+        if self.mode == self.MODE_SINGLE_SHOT:
+            self._last_shot = None
+        else:
+            await self._start_periodic()
+
+    async def stop(self):
+        if self._shot_task is not None:
+            # A running single shot must finish before the sensor responds again.
+            while self._shot_task is not None:
+                await asyncio.sleep_ms(100)
+        await self._scd4x.stop_periodic_measurement_async()
+
+    def compensate(self, temperature):
+        """Use a reference temperature (SHT4x) to correct the SCD4X self heating."""
+        self._reference_temperature = temperature
+
+    async def read(self):
+        """Returns a (co2, temperature, rh) tuple or None if there is no new data."""
+        if self.mode != self.MODE_SINGLE_SHOT:
+            reading = await self._read()
+            if self._pending_offset is not None:
+                await self._restart_with_offset()
+            return reading
+
+        if self._shot_task is not None:
+            return None  # Sensor is busy measuring and won't ACK.
+        # Read the finished shot before starting the next one
+        reading = None
+        if self._last_shot is not None:
+            reading = await self._read()
+        if self._last_shot is None or ticks_diff(
+            ticks_ms(), self._last_shot
+        ) >= int(self._interval * 1000):
+            self._last_shot = ticks_ms()
+            self._apply_temperature_offset()
+            # Measuring from now on, the result is read on a later call.
+            self._shot_task = asyncio.create_task(self._single_shot())
+        return reading
+
+    async def _read(self):
+        reading = await self._scd4x.read_if_ready()
+        if reading is not None:
+            self._update_temperature_offset(reading[1])
+        return reading
+
+    async def _start_periodic(self):
+        if self.mode == self.MODE_PERIODIC:
+            await self._scd4x.start_periodic_measurement_async()
+        else:
+            await self._scd4x.start_low_periodic_measurement_async()
+
+    async def _restart_with_offset(self):
+        # The offset can only be written while the sensor is idle.
+        await self._scd4x.stop_periodic_measurement_async()
+        self._apply_temperature_offset()
+        await self._start_periodic()
+
+    async def _single_shot(self):
+        try:
+            await self._scd4x.measure_single_shot_async()
+        finally:
+            self._shot_task = None
+
+    def _update_temperature_offset(self, scd_temperature):
+        if self._reference_temperature is None or self._temperature_offset is None:
+            return
+        offset = self._temperature_offset + scd_temperature - self._reference_temperature
+        offset = min(max(offset, 0.0), self.MAX_TEMPERATURE_OFFSET)
+        if abs(offset - self._temperature_offset) >= 0.5:
+            logger.debug(f"SCD4X temperature offset pending: {offset:.1f}C")
+            self._pending_offset = offset
+
+    def _apply_temperature_offset(self):
+        offset = self._pending_offset
+        if offset is None:
+            return
+        self._scd4x.temperature_offset = offset
+        self._temperature_offset = offset
+        self._pending_offset = None
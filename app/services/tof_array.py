@@ -0,0 +1,185 @@
+import asyncio
+import time
+
+from machine import Pin
+
+from app.services.log import LogServiceManager
+from drivers.range_sensor import QualityAverage
+from app.utils.filtering import TofDistanceFilter, TofTrackingFilter
+
+# Create logger
+logger = LogServiceManager.get_logger(name=__name__)
+
+TOF_DEFAULT_ADDR = 0x29
+
+
+class TofSlot:
+    """A sensor in the array together with the filter state of the jar it watches."""
+
+    def __init__(self, index, sensor, address, tracking=False):
+        self.index = index
+        self.sensor = sensor
+        self.address = address
+        self.filter = TofDistanceFilter()
+        # Optional Kalman stage, fed every raw reading with its sigma
+        self.tracker = TofTrackingFilter() if tracking else None
+        self.raw_distance = 0
+        self.distance = 0
+        self.rise_rate = 0  # mm/h, only with tracking
+        self.average = QualityAverage()
+        self.samples = None  # Samples per update, overrides the array default
+        self.active = True  # Idle slots are neither started nor sampled
+        self.waiting_since = 0  # ticks_ms of the last reading while sampling
+
+
+class TofArray:
+    """Manages several ToF sensors sharing one I2C bus.
+
+    All sensors power up on the same default address, so they are brought up
+    one at a time through their XSHUT pins and moved to a unique address
+    before the next one is enabled. Once running, every sensor ranges
+    continuously in its own window and the array polls them round-robin, so
+    N sensors take as long to sample as one.
+
+    With `tracking`, distances come from a `TofTrackingFilter` per sensor
+    instead of the median/EMA filter, and a rise rate is available.
+    """
+
+    def __init__(self, sensors, addresses=None, tracking=False):
+        if not sensors:
+            raise ValueError("TofArray needs at least one sensor.")
+        if addresses is None:
+            addresses = [TOF_DEFAULT_ADDR] * len(sensors)
+        self.slots = [
+            TofSlot(i, sensor, address, tracking)
+            for i, (sensor, address) in enumerate(zip(sensors, addresses))
+        ]
+
+    @classmethod
+    async def boot(cls, i2c, xshut_pins, factory, base_address=0x30, tracking=False):
+        """Bring up one sensor per XSHUT pin and assign consecutive addresses.
+
+        `factory` is called with the bus and returns a `RangeSensor` adapter.
+        Adapters without an address (not on I2C) keep None.
+        The reset and boot delays are awaited, the sensor initialisation done
+        by `factory` is not.
+        """
+        pins = [Pin(pin, Pin.OUT, value=0) for pin in xshut_pins]
+        await asyncio.sleep_ms(10)  # All sensors held in reset
+
+        sensors = []
+        addresses = []
+        for i, pin in enumerate(pins):
+            address = base_address + i
+            logger.info(f"Booting ToF sensor {i}...")
+            pin.value(1)
+            await asyncio.sleep_ms(10)  # Boot time after XSHUT release
+            sensor = factory(i2c)
+            if hasattr(sensor, "set_address"):
+                logger.info(f"ToF sensor {i} at 0x{address:02x}")
+                sensor.set_address(address)
+            else:
+                address = None
+            sensors.append(sensor)
+            addresses.append(address)
+
+        return cls(sensors, addresses, tracking)
+
+    def __len__(self):
+        return len(self.slots)
+
+    @property
+    def sensors(self):
+        return [slot.sensor for slot in self.slots]
+
+    @property
+    def active_slots(self):
+        return [slot for slot in self.slots if slot.active]
+
+    def activate(self, count):
+        """Use only the first `count` sensors, the others stay idle."""
+        for slot in self.slots:
+            slot.active = slot.index < count
+
+    def start(self):
+        for slot in self.active_slots:
+            slot.sensor.start()
+
+    def stop(self):
+        for slot in self.slots:
+            slot.sensor.stop()
+
+    def configure(self, timing_budget):
+        for slot in self.slots:
+            slot.sensor.set_budget(timing_budget)
+            slot.samples = None
+
+    def configure_slot(self, index, timing_budget, samples):
+        """Use settings tuned for the jar watched by one sensor."""
+        slot = self.slots[index]
+        slot.sensor.set_budget(timing_budget)
+        slot.samples = samples
+
+    async def sample(self, num_samples, target_error_mm=None):
+        """Average up to ``num_samples`` readings from every active sensor and
+        filter them.
+
+        Slots configured with their own sample count use it instead.
+
+        Readings are weighted by their quality and invalid ones are dropped,
+        see `QualityAverage`. A sensor is done early once the standard error
+        of its average reaches ``target_error_mm``, and gives up after twice
+        ``num_samples`` readings. Sensors are polled in turn and read as soon
+        as they have data, so the ranging windows of all sensors overlap.
+
+        A sensor with no reading ready within its `timeout_ms` is given up on
+        for this update, keeping the readings it already gave.
+        """
+        slots = self.active_slots
+        pending = set()
+        start = time.ticks_ms()
+        for slot in slots:
+            slot.average.reset()
+            slot.waiting_since = start
+            pending.add(slot)
+        while pending:
+            now = time.ticks_ms()
+            for slot in slots:
+                if slot not in pending:
+                    continue
+                sensor = slot.sensor
+                if not sensor.ready():
+                    if time.ticks_diff(now, slot.waiting_since) > sensor.timeout_ms:
+                        logger.warning(f"ToF {slot.index}: not responding, skipped")
+                        pending.discard(slot)
+                    continue
+                slot.waiting_since = now
+                distance = sensor.read()
+                average = slot.average
+                average.add(sensor)
+                if slot.tracker:
+                    slot.tracker.update(distance, sensor.sigma_mm, sensor.status)
+                samples = slot.samples or num_samples
+                if (
+                    average.count >= samples
+                    or average.count + average.rejected >= 2 * samples
+                    or (target_error_mm is not None and average.done(target_error_mm))
+                ):
+                    pending.discard(slot)
+            await asyncio.sleep_ms(1)
+
+        for slot in slots:
+            average = slot.average
+            if average.count:
+                slot.raw_distance = round(average.mean)
+            logger.debug(
+                f"ToF {slot.index}: {average.count} samples "
+                f"({average.effective_count:.1f} effective, {average.rejected} rejected)"
+            )
+            tracker = slot.tracker
+            if tracker and tracker.distance is not None:
+                slot.distance = tracker.distance
+                slot.rise_rate = tracker.rise_rate
+            elif average.count:
+                slot.distance = slot.filter.update(slot.raw_distance)
+        return [slot.distance for slot in self.slots]
@@ -0,0 +1,96 @@
+from math import ceil
+
+from app.services.log import LogServiceManager
+from drivers.range_sensor import QualityAverage
+import config
+
+# Create logger
+logger = LogServiceManager.get_logger(name=__name__)
+
+
+class TofTuner:
+    """Picks the ToF timing budget and sample count for a jar.
+
+    Longer budgets integrate more photons and give less noisy readings, more
+    samples average the noise down. Both cost sensor on-time, budget x
+    readings. The tuner measures the noise at each candidate budget on the
+    actual surface and distance, works out how many readings reach the target
+    standard error and keeps the cheapest combination.
+
+    Budgets are probed from the shortest up and probing stops as soon as a
+    single reading at the next budget would cost more than the best found, so
+    clean surfaces are tuned after one or two budget changes.
+    """
+
+    BUDGETS_MS = (10, 20, 33, 50, 100, 200)
+    PROBE_SAMPLES = 8
+
+    def __init__(self, sensor, max_samples=None, probe_samples=None):
+        self._sensor = sensor
+        self._max_samples = config.TOF_SAMPLES if max_samples is None else max_samples
+        self._probe_samples = self.PROBE_SAMPLES if probe_samples is None else probe_samples
+        self._average = QualityAverage()
+
+    def budgets(self):
+        sensor = self._sensor
+        return [
+            b for b in self.BUDGETS_MS if sensor.MIN_BUDGET_MS <= b <= sensor.MAX_BUDGET_MS
+        ] or [sensor.DEFAULT_BUDGET_MS]
+
+    async def noise(self, budget_ms):
+        """Standard deviation of a single reading in mm and the fraction of
+        readings accepted, at the given budget."""
+        sensor = self._sensor
+        sensor.set_budget(budget_ms)
+        sensor.start()
+        _, average = await sensor.read_average(self._probe_samples, average=self._average)
+        if average.count < 2:
+            return None, 0
+        std_dev = average.std_error * average.effective_count**0.5
+        accepted = average.count / (average.count + average.rejected)
+        return std_dev, accepted
+
+    async def tune(self, target_error_mm=None):
+        """Returns the (budget_ms, samples) pair with the lowest on-time that
+        reaches `target_error_mm`. If none does, the most precise one.
+
+        Nothing else may read the sensor while tuning. The sensor is left at
+        whichever budget was probed last, the caller sets the one to use."""
+        if target_error_mm is None:
+            target_error_mm = config.TOF_TARGET_ERROR_MM
+
+        best = None  # (cost, budget, samples)
+        fallback = None  # (error, budget, samples)
+        for budget in self.budgets():
+            if best and budget >= best[0]:
+                break  # Even one reading costs more than the best so far
+            std_dev, accepted = await self.noise(budget)
+            if std_dev is None:
+                logger.debug(f"Budget {budget} ms: no valid readings")
+                continue
+
+            samples = max(1, ceil((std_dev / target_error_mm) ** 2))
+            readings = samples / accepted
+            cost = budget * readings
+            logger.debug(
+                f"Budget {budget} ms: noise {std_dev:.2f} mm, "
+                f"{samples} samples, {cost:.0f} ms"
+            )
+            if samples <= self._max_samples:
+                if best is None or cost < best[0]:
+                    best = (cost, budget, samples)
+            else:
+                error = std_dev / self._max_samples**0.5
+                if fallback is None or error < fallback[0]:
+                    fallback = (error, budget, self._max_samples)
+
+        if best:
+            _, budget, samples = best
+        elif fallback:
+            error, budget, samples = fallback
+            logger.info(f"Target {target_error_mm} mm not reachable, best {error:.2f} mm")
+        else:
+            budget, samples = config.TOF_TIMING_BUDGET, self._max_samples
+
+        logger.info(f"ToF tuned: {budget} ms x {samples} samples")
+        return budget, samples
@@ -1,5 +1,5 @@
 # web_templates.py
-def page(title, inner_html, css_text=""):
+def page_start(title):
     return """<!doctype html>
 <html lang="en">
 <head>
@@ -7,7 +7,7 @@ def page(title, inner_html, css_text=""):
   <meta name="viewport" content="width=device-width, initial-scale=1">
   <title>{}</title>
   <link rel="icon" href="data:,">
-  <style>{}</style>
+  <link rel="stylesheet" href="/style.css">
 </head>
 <body>
   <div class="wrap">
@@ -16,27 +16,41 @@ def page(title, inner_html, css_text=""):
         <h1>{}</h1>
         <p>Select a network and enter the password to connect.</p>
       </header>
-      {}
+""".format(
+        title, title
+    )
+
+
+def page_end():
+    return """
       <footer>Fermento • Captive Portal</footer>
     </div>
   </div>
 </body>
-</html>""".format(
-        title, css_text, title, inner_html
-    )
+</html>"""
 
 
-def wifi_form(network_rows_html):
+def page(title, inner_html):
+    return page_start(title) + inner_html + page_end()
+
+
+def wifi_form_start():
     return """<form action="/configure" method="post" accept-charset="utf-8">
   <div class="list">
-    {}
+"""
+
+
+def wifi_form_end():
+    return """
   </div>
   <p style="margin:10px 0 6px 0">Password</p>
   <input class="field" type="password" id="password" name="password" placeholder="Enter WiFi password">
   <button class="btn" type="submit">Connect</button>
-</form>""".format(
-        network_rows_html
-    )
+</form>"""
+
+
+def wifi_form(network_rows_html):
+    return wifi_form_start() + network_rows_html + wifi_form_end()
 
 
 def network_row(ssid, safe_id, checked=False):
@@ -1,16 +1,70 @@
 # wifi_manager.py
 # Author: Igor Ferreira
 # License: MIT
-# Version: 2.1.0 (UI refactor: inline CSS from file)
+# Version: 2.4.0 (fast reconnect to the last access point, background scans)
 # Description: WiFi Manager for ESP8266 and ESP32 using MicroPython.
 
+import asyncio
+import json
 import machine
 import network
-import socket
 import re
 import time
-
-from app.services.web.web_templates import page, wifi_form, network_row, message_box
+from binascii import hexlify, unhexlify
+
+from app.services.web.web_templates import (
+    page_start,
+    page_end,
+    wifi_form_start,
+    wifi_form_end,
+    network_row,
+    message_box,
+)
+
+# Request limits, larger requests are answered with 413
+MAX_REQUEST_LINE = 512
+MAX_HEADERS = 2048
+MAX_BODY = 512
+# Requests are read in chunks of at most this many bytes
+READ_CHUNK = 128
+# Seconds a client has to send its request
+REQUEST_TIMEOUT = 5
+
+# Connection attempt timeouts in ms. A direct connect to the cached access
+# point either works quickly or the AP is gone, so it gives up sooner.
+CONNECT_TIMEOUT = 10000
+DIRECT_CONNECT_TIMEOUT = 5000
+CONNECT_POLL_MS = 50
+# Seconds between scans refreshing the portal's network list
+SCAN_INTERVAL = 30
+
+# Station statuses meaning the attempt is over, the ones a port lacks are skipped
+_FAILED = tuple(
+    getattr(network, name)
+    for name in ("STAT_WRONG_PASSWORD", "STAT_NO_AP_FOUND", "STAT_CONNECT_FAIL")
+    if hasattr(network, name)
+)
+
+# Static assets, gzipped at build time by tools/compile.py
+STATIC_FILES = {b"style.css": "text/css"}
+STATIC_MAX_AGE = 86400
+STATIC_CHUNK = 512
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class Request:
+    def __init__(self, method, path, body=b"", gzip=False):
+        self.method = method
+        self.path = path
+        self.body = body
+        self.gzip = gzip  # Client accepts gzip encoded responses
 
 
 class WifiManager:
@@ -34,6 +88,11 @@ class WifiManager:
 
         # Credentials file (plaintext)
         self.wifi_credentials = "wifi.dat"
+        # Last access point connected to, for a direct reconnect at boot
+        self.wifi_cache = "wifi_cache.json"
+        # Latest scan results for the portal, refreshed in the background
+        self._networks = None
+        self._scan_task = None
 
         # Prevent auto-connect to last network unless you do it explicitly
         self.wlan_sta.disconnect()
@@ -41,33 +100,115 @@ class WifiManager:
         self.reboot = reboot
         self.debug = debug
 
-        # Pre-compiled regex for routing
-        self._route_re = re.compile(b"(?:GET|POST) /(.*?)(?:\\?.*?)? HTTP")
+        # Pre-compiled request line regex and route table
+        self._route_re = re.compile(b"(GET|POST) /([^ ?]*)[^ ]* HTTP")
+        self._routes = {
+            (b"GET", b""): self.handle_root,
+            (b"POST", b"configure"): self.handle_configure,
+        }
+        for path in STATIC_FILES:
+            self._routes[(b"GET", path)] = self.handle_static
+        self._connect_lock = asyncio.Lock()
+        self._status_callback = None
 
-        # Web assets location + inline CSS cache
+        # Web assets location, static files are streamed from flash
         self.web_root = "app/services/web"
-        self.css_text = ""
-        try:
-            with open(self.web_root + "/style.css", "r") as f:
-                self.css_text = f.read()
-        except Exception as e:
-            if self.debug:
-                print("Could not load style.css:", e)
+        self._static_buffer = bytearray(STATIC_CHUNK)
 
     # -------------------------
     # WiFi helpers
     # -------------------------
-    def connect(self):
+    async def connect(self, rescan=True):
+        """Connect to a known network.
+
+        The access point used last time is tried first, directly by BSSID,
+        which skips the scan entirely. Only if that fails are the networks
+        scanned and the known ones tried, strongest first.
+
+        wlan.scan() blocks the event loop for a couple of seconds, so with
+        `rescan` False the known networks are tried by SSID instead, letting
+        the station find them without holding up other tasks.
+        """
         if self.wlan_sta.isconnected():
             return True
         profiles = self.read_credentials()
-        for ssid, *_ in self.wlan_sta.scan():
-            ssid = ssid.decode("utf-8")
+
+        cache = self.read_cache()
+        if cache and cache["ssid"] in profiles:
+            ssid = cache["ssid"]
+            if await self.wifi_connect_async(
+                ssid, profiles[ssid], cache["bssid"], DIRECT_CONNECT_TIMEOUT
+            ):
+                return True
+
+        if not rescan:
+            for ssid, password in profiles.items():
+                if await self.wifi_connect_async(ssid, password):
+                    return True
+            return False
+
+        scanned = self.scan()
+        for ssid, bssid, channel, *_ in scanned:
             if ssid in profiles:
-                if self.wifi_connect(ssid, profiles[ssid]):
+                if await self.wifi_connect_async(ssid, profiles[ssid], bssid):
+                    self.write_cache(ssid, bssid, channel)
                     return True
         return False
 
+    def scan(self):
+        """Scan once, returns (ssid, bssid, channel, rssi) tuples, strongest
+        first, and keeps them for the portal's network list.
+
+        The station refuses to scan while it is connecting, a failed scan
+        returns the last results instead of replacing them."""
+        try:
+            scanned = self.wlan_sta.scan()
+        except Exception as error:
+            if self.debug:
+                print("scan() failed:", error)
+            return self._networks or []
+
+        networks = []
+        for ssid, bssid, channel, rssi, *_ in scanned:
+            try:
+                ssid = ssid.decode("utf-8")
+            except Exception:
+                continue
+            if ssid:
+                networks.append((ssid, bssid, channel, rssi))
+        networks.sort(key=lambda n: n[3], reverse=True)
+        self._networks = networks
+        return networks
+
+    async def scan_loop(self):
+        # wlan.scan() blocks for a couple of seconds, so scan rarely and let
+        # page loads use the last result.
+        while True:
+            self.scan()
+            await asyncio.sleep(SCAN_INTERVAL)
+
+    def read_cache(self):
+        try:
+            with open(self.wifi_cache) as file:
+                cache = json.load(file)
+            cache["bssid"] = unhexlify(cache["bssid"])
+            return cache
+        except Exception as error:
+            if self.debug:
+                print("No WiFi cache:", error)
+            return None
+
+    def write_cache(self, ssid, bssid, channel):
+        try:
+            with open(self.wifi_cache, "w") as file:
+                json.dump(
+                    {"ssid": ssid, "bssid": hexlify(bssid).decode(), "channel": channel},
+                    file,
+                )
+        except Exception as error:
+            if self.debug:
+                print("Could not write WiFi cache:", error)
+
     def disconnect(self):
         if self.wlan_sta.isconnected():
             self.wlan_sta.disconnect()
@@ -104,191 +245,318 @@ class WifiManager:
                     print("Bad credentials line:", line, error)
         return profiles
 
-    def wifi_connect(self, ssid, password):
-        print("Trying to connect to:", ssid)
-        self.wlan_sta.connect(ssid, password)
-        for _ in range(100):
-            if self.wlan_sta.isconnected():
-                print("\nConnected! Network information:", self.wlan_sta.ifconfig())
-                return True
-            print(".", end="")
-            time.sleep_ms(100)
-        print("\nConnection failed!")
-        self.wlan_sta.disconnect()
-        return False
+    async def wifi_connect_async(
+        self, ssid, password, bssid=None, timeout_ms=CONNECT_TIMEOUT
+    ):
+        # The event loop keeps running while waiting and a failure reported
+        # by the station ends the attempt early.
+        async with self._connect_lock:
+            print("Trying to connect to:", ssid)
+            if bssid:
+                self.wlan_sta.connect(ssid, password, bssid=bssid)
+            else:
+                self.wlan_sta.connect(ssid, password)
+            start = time.ticks_ms()
+            while time.ticks_diff(time.ticks_ms(), start) < timeout_ms:
+                if self.wlan_sta.isconnected():
+                    print("\nConnected! Network information:", self.wlan_sta.ifconfig())
+                    return True
+                if self.wlan_sta.status() in _FAILED:
+                    break
+                await asyncio.sleep_ms(CONNECT_POLL_MS)
+            print("\nConnection failed!")
+            self.wlan_sta.disconnect()
+            return False
+
+    def _status(self, message):
+        if self._status_callback:
+            self._status_callback(message)
 
     # -------------------------
     # HTTP helpers
     # -------------------------
-    def send_header(self, status_code=200, content_type="text/html"):
-        reasons = {
-            200: "OK",
-            400: "Bad Request",
-            404: "Not Found",
-            500: "Internal Server Error",
-        }
-        reason = reasons.get(status_code, "OK")
+    async def read_line(self, reader, pending, limit):
+        """Read one line, returns it and the bytes read past it.
 
-        self.client.send("HTTP/1.1 {} {}\r\n".format(status_code, reason))
-        self.client.send("Content-Type: {}\r\n".format(content_type))
-        self.client.send("Connection: close\r\n\r\n")
+        The stream is read in chunks and never more than `limit` bytes are
+        buffered: ValueError(413) is raised once that many go by without a
+        line end. Returns what is left when the client stops sending.
+        """
+        while True:
+            end = pending.find(b"\n")
+            if end >= 0:
+                return pending[: end + 1], pending[end + 1 :]
+            if len(pending) >= limit:
+                raise ValueError(413)
+            chunk = await reader.read(min(READ_CHUNK, limit - len(pending)))
+            if not chunk:
+                return pending, b""
+            pending += chunk
+
+    async def read_request(self, reader):
+        """Parse a request into a `Request`. Raises ValueError with the status
+        code to answer when the request is malformed or too large."""
+        line, pending = await self.read_line(reader, b"", MAX_REQUEST_LINE)
+        if not line:
+            raise ValueError(400)
+        m = self._route_re.match(line)
+        if not m:
+            raise ValueError(400)
+        method = m.group(1)
+        path = m.group(2).rstrip(b"/")
+
+        length = 0
+        gzip = False
+        header_bytes = 0
+        while True:
+            line, pending = await self.read_line(
+                reader, pending, MAX_HEADERS - header_bytes
+            )
+            header_bytes += len(line)
+            if header_bytes > MAX_HEADERS:
+                raise ValueError(413)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name = line[:16].lower()
+            if name.startswith(b"content-length:"):
+                try:
+                    length = int(line[15:])
+                except ValueError:
+                    raise ValueError(400)
+            elif name == b"accept-encoding:":
+                gzip = b"gzip" in line
+
+        if length > MAX_BODY:
+            raise ValueError(413)
+        # Part of the body may already have been read with the headers
+        body = pending[:length]
+        if len(body) < length:
+            body += await reader.readexactly(length - len(body))
+        return Request(method, path, body, gzip)
+
+    async def send(self, writer, text):
+        writer.write(text.encode("utf-8") if isinstance(text, str) else text)
+        await writer.drain()
+
+    async def send_header(
+        self, writer, status_code=200, content_type="text/html", headers=""
+    ):
+        reason = REASONS.get(status_code, "OK")
+        await self.send(
+            writer,
+            "HTTP/1.1 {} {}\r\nContent-Type: {}\r\n{}Connection: close\r\n\r\n".format(
+                status_code, reason, content_type, headers
+            ),
+        )
 
-    def send_text(self, text, status_code=200, content_type="text/html"):
-        self.send_header(status_code, content_type)
-        if isinstance(text, str):
-            text = text.encode("utf-8")
-        self.client.sendall(text)
+    async def send_chunks(self, writer, chunks, status_code=200):
+        """Stream a page, each chunk is sent as soon as it is produced so the
+        page is never built whole in RAM."""
+        await self.send_header(writer, status_code)
+        await self.send(writer, page_start("WiFi Manager"))
+        for chunk in chunks:
+            await self.send(writer, chunk)
+        await self.send(writer, page_end())
 
-    def send_response(self, inner_html, status_code=200):
-        html = page("WiFi Manager", inner_html, self.css_text)
-        self.send_text(html, status_code, "text/html")
+    async def send_response(self, writer, inner_html, status_code=200):
+        await self.send_chunks(writer, (inner_html,), status_code)
 
     # -------------------------
     # Route handlers
     # -------------------------
-    def handle_root(self):
-        rows = []
+    def network_rows(self):
+        networks = self._networks
+        if networks is None:
+            networks = self.scan()
+
         first = True
+        for ssid, *_ in networks:
+            safe_id = str(abs(hash(ssid)) % 100000)
+            yield network_row(ssid, safe_id, checked=first)
+            first = False
 
-        try:
-            scanned = self.wlan_sta.scan()
-        except Exception as error:
-            if self.debug:
-                print("scan() failed:", error)
-            scanned = []
+        if first:
+            yield network_row("No networks found (refresh)", "0", checked=True)
 
-        for ssid, *_ in scanned:
-            try:
-                ssid = ssid.decode("utf-8")
-            except Exception:
-                continue
+    def root_chunks(self):
+        yield wifi_form_start()
+        yield from self.network_rows()
+        yield wifi_form_end()
 
-            safe_id = str(abs(hash(ssid)) % 100000)
-            rows.append(network_row(ssid, safe_id, checked=first))
-            first = False
+    async def handle_root(self, writer, request):
+        await self.send_chunks(writer, self.root_chunks())
 
-        if not rows:
-            rows_html = network_row("No networks found (refresh)", "0", checked=True)
+    async def handle_configure(self, writer, request):
+        fields = self.parse_form(request.body)
+        ssid = fields.get("ssid")
+        password = fields.get("password", "")
+        if ssid is None:
+            await self.send_response(
+                writer, message_box("<p>Parameters not found!</p>", ok=False), 400
+            )
+        elif len(ssid) == 0:
+            await self.send_response(
+                writer,
+                message_box(
+                    "<p>SSID must be provided.</p><p>Go back and try again.</p>",
+                    ok=False,
+                ),
+                400,
+            )
         else:
-            rows_html = "\n".join(rows)
-
-        content = wifi_form(rows_html)
-        self.send_response(content)
-
-    def handle_configure(self):
-        match = re.search(b"ssid=([^&]*)&password=(.*)", self.url_decode(self.request))
-        if match:
-            ssid = match.group(1).decode("utf-8")
-            password = match.group(2).decode("utf-8")
-
-            if len(ssid) == 0:
-                self.send_response(
-                    message_box(
-                        "<p>SSID must be provided.</p><p>Go back and try again.</p>",
-                        ok=False,
-                    ),
-                    400,
-                )
-            elif self.wifi_connect(ssid, password):
+            self._status("Connecting to " + ssid)
+            if await self.wifi_connect_async(ssid, password):
                 html = "<p>Successfully connected to</p><h1>{}</h1><p>IP address: <b>{}</b></p>".format(
                     ssid, self.wlan_sta.ifconfig()[0]
                 )
-                self.send_response(message_box(html, ok=True))
+                await self.send_response(writer, message_box(html, ok=True))
 
                 profiles = self.read_credentials()
                 profiles[ssid] = password
                 self.write_credentials(profiles)
-                time.sleep(5)
+                # Remember the access point for a direct connect next boot
+                for name, bssid, channel, _ in self._networks or ():
+                    if name == ssid:
+                        self.write_cache(ssid, bssid, channel)
+                        break
+                self._status("Connected")
             else:
                 html = "<p>Could not connect to</p><h1>{}</h1><p>Go back and try again.</p>".format(
                     ssid
                 )
-                self.send_response(message_box(html, ok=False))
-                time.sleep(5)
-        else:
-            self.send_response(
-                message_box("<p>Parameters not found!</p>", ok=False), 400
-            )
-            time.sleep(5)
+                await self.send_response(writer, message_box(html, ok=False))
+                self._status("Failed, try again")
+
+    async def handle_static(self, writer, request):
+        # Prefer the gzipped copy, sent as is, the browser inflates it
+        path = self.web_root + "/" + request.path.decode()
+        headers = "Cache-Control: max-age={}\r\n".format(STATIC_MAX_AGE)
+        f = None
+        if request.gzip:
+            try:
+                f = open(path + ".gz", "rb")
+                headers += "Content-Encoding: gzip\r\n"
+            except OSError:
+                pass
+        if f is None:
+            try:
+                f = open(path, "rb")
+            except OSError:
+                await self.handle_not_found(writer, request)
+                return
 
-    def handle_not_found(self):
-        self.send_response(message_box("<p>Page not found!</p>", ok=False), 404)
+        with f:
+            size = f.seek(0, 2)
+            f.seek(0)
+            headers += "Content-Length: {}\r\n".format(size)
+            await self.send_header(writer, 200, STATIC_FILES[request.path], headers)
+            # Reuse the shared buffer, a concurrent download allocates its own
+            buf = self._static_buffer
+            if buf is None:
+                buf = bytearray(STATIC_CHUNK)
+            self._static_buffer = None
+            try:
+                mv = memoryview(buf)
+                while n := f.readinto(buf):
+                    await self.send(writer, mv[:n])
+            finally:
+                self._static_buffer = buf
+
+    async def handle_not_found(self, writer, request):
+        await self.send_response(
+            writer, message_box("<p>Page not found!</p>", ok=False), 404
+        )
+
+    async def handle_error(self, writer, status_code):
+        await self.send_response(
+            writer,
+            message_box("<p>{}</p>".format(REASONS[status_code]), ok=False),
+            status_code,
+        )
 
     # -------------------------
     # Web server
     # -------------------------
-    def web_server(self):
+    async def serve_client(self, reader, writer):
+        try:
+            try:
+                request = await asyncio.wait_for(
+                    self.read_request(reader), REQUEST_TIMEOUT
+                )
+            except ValueError as error:
+                await self.handle_error(writer, error.args[0])
+                return
+            if self.debug:
+                print(request.method, request.path)
+            handler = self._routes.get(
+                (request.method, request.path), self.handle_not_found
+            )
+            await handler(writer, request)
+        except Exception as error:
+            # Timeouts and clients going away
+            if self.debug:
+                print(error)
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def web_server(self, status=None):
+        """Run the captive portal until a network is configured.
+
+        Clients are served concurrently by the event loop, so the GUI stays
+        alive. `status`, if given, is called with short progress messages.
+        """
+        self._status_callback = status
         self.wlan_ap.active(True)
         self.wlan_ap.config(
             essid=self.ap_ssid, password=self.ap_password, authmode=self.ap_authmode
         )
 
-        server_socket = socket.socket()
-        server_socket.close()
-        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server_socket.bind(("", 80))
-        server_socket.listen(1)
+        server = await asyncio.start_server(
+            self.serve_client, "0.0.0.0", 80, backlog=4
+        )
 
+        address = self.wlan_ap.ifconfig()[0]
         print(
             "Connect to",
             self.ap_ssid,
             "with the password",
             self.ap_password,
             "and access the captive portal at",
-            self.wlan_ap.ifconfig()[0],
+            address,
         )
+        self._status(address)
+        self._scan_task = asyncio.create_task(self.scan_loop())
 
-        while True:
-            if self.wlan_sta.isconnected():
-                self.wlan_ap.active(False)
-                if self.reboot:
-                    print("Resetting device...")
-                    machine.reset()
-
-            self.client, addr = server_socket.accept()
-            try:
-                self.client.settimeout(5.0)
-                self.request = b""
-
-                try:
-                    while True:
-                        if b"\r\n\r\n" in self.request:
-                            # Fix for Safari browser
-                            self.request += self.client.recv(512)
-                            break
-                        self.request += self.client.recv(128)
-                except Exception as error:
-                    if self.debug:
-                        print(error)
-
-                if self.request:
-                    if self.debug:
-                        print(self.url_decode(self.request))
-
-                    m = self._route_re.search(self.request)
-                    if not m:
-                        self.handle_not_found()
-                        continue
-
-                    url = m.group(1).decode("utf-8").rstrip("/")
-
-                    if url == "":
-                        self.handle_root()
-                    elif url == "configure":
-                        self.handle_configure()
-                    else:
-                        self.handle_not_found()
-
-            except Exception as error:
-                if self.debug:
-                    print(error)
-                return
-            finally:
-                try:
-                    self.client.close()
-                except Exception:
-                    pass
+        try:
+            while not self.wlan_sta.isconnected():
+                await asyncio.sleep_ms(500)
+            # Let the result page reach the browser
+            await asyncio.sleep(5)
+        finally:
+            self._scan_task.cancel()
+            self._scan_task = None
+            server.close()
+            await server.wait_closed()
+            self.wlan_ap.active(False)
+            self._status_callback = None
+
+        if self.reboot:
+            print("Resetting device...")
+            machine.reset()
+        return True
+
+    def parse_form(self, body):
+        """Decode an application/x-www-form-urlencoded body into a dict."""
+        fields = {}
+        for pair in body.split(b"&"):
+            key, _, value = pair.partition(b"=")
+            key = self.url_decode(key.replace(b"+", b" ")).decode("utf-8")
+            fields[key] = self.url_decode(value.replace(b"+", b" ")).decode("utf-8")
+        return fields
 
     # -------------------------
     # URL decoding
@@ -0,0 +1,41 @@
+import time
+
+from app.services.log import LogServiceManager
+
+logger = LogServiceManager.get_logger(name=__name__)
+
+# (name, ms since reset) of every boot stage reached, in order
+stages = []
+# (module, ms, heap bytes) of every lazily imported module, in order
+imports = []
+_listener = None
+
+
+def set_listener(callback):
+    """Call `callback(name)` on every stage, e.g. to show boot progress."""
+    global _listener
+    _listener = callback
+
+
+def stage(name):
+    """Record that boot reached a stage. Stages from tasks running in
+    parallel interleave, the timestamps show how they overlapped."""
+    ms = time.ticks_ms()  # Counts from reset
+    stages.append((name, ms))
+    logger.info(f"Boot: {name} at {ms} ms")
+    if _listener:
+        _listener(name)
+
+
+def imported(module, ms, heap):
+    imports.append((module, ms, heap))
+    logger.debug(f"Imported {module} in {ms} ms, {heap} bytes")
+
+
+def report():
+    previous = 0
+    for name, ms in stages:
+        logger.info(f"Boot: {ms:6d} ms (+{ms - previous:5d}) {name}")
+        previous = ms
+    for module, ms, heap in imports:
+        logger.info(f"Import: {ms:5d} ms {heap:7d} B {module}")
@@ -1,17 +1,76 @@
+import time
+from array import array
+
+from drivers.range_sensor import STATUS_INVALID, STATUS_VALID, STATUS_WARNING
+
+
 class TofDistanceFilter:
+    """Median -> EMA -> deadband filter for ToF distances in mm.
+
+    The median window is kept twice in preallocated arrays: as a ring in
+    arrival order, to know which sample leaves the window, and sorted, so the
+    median is a lookup. Each sample is placed with a binary search and an in
+    place shift, nothing is allocated per sample.
+    """
+
     def __init__(self, median_n=5, alpha=0.25, deadband_mm=2.0):
         self.n = median_n
         self.alpha = alpha
         self.deadband = deadband_mm
-        self.buf = []
+        self._ring = array("h", [0] * median_n)
+        self._sorted = array("h", [0] * median_n)
+        self._head = 0  # Next ring position to write
+        self._count = 0
+        self.y = None  # EMA state
+        self.out = None  # Held output
+
+    def reset(self):
+        self._head = 0
+        self._count = 0
         self.y = None
+        self.out = None
+
+    def _find(self, value, count):
+        # Leftmost position where value can be inserted in the sorted window
+        lo = 0
+        hi = count
+        s = self._sorted
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if s[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _median(self, x):
+        s = self._sorted
+        count = self._count
+        if count == self.n:
+            # Drop the oldest sample from the sorted window
+            oldest = self._ring[self._head]
+            i = self._find(oldest, count)
+            count -= 1
+            while i < count:
+                s[i] = s[i + 1]
+                i += 1
+        else:
+            self._count += 1
+        self._ring[self._head] = x
+        self._head = (self._head + 1) % self.n
+
+        # Insert the new sample
+        i = self._find(x, count)
+        j = count
+        while j > i:
+            s[j] = s[j - 1]
+            j -= 1
+        s[i] = x
+        return s[self._count >> 1]
 
     def update(self, x_mm):
         # Median stage (reject spikes)
-        self.buf.append(x_mm)
-        if len(self.buf) > self.n:
-            self.buf.pop(0)
-        m = sorted(self.buf)[len(self.buf) // 2]
+        m = self._median(int(x_mm))
 
         # EMA stage (smooth)
         if self.y is None:
@@ -19,7 +78,125 @@ class TofDistanceFilter:
         else:
             self.y = self.y + self.alpha * (m - self.y)
 
-        # Deadband (stop tiny wiggle)
-        if abs(m - self.y) < self.deadband:
-            return self.y
-        return self.y
+        # Deadband (stop tiny wiggle): hold the output until the smoothed
+        # value has moved by at least the deadband.
+        if self.out is None or abs(self.y - self.out) >= self.deadband:
+            self.out = self.y
+        return self.out
+
+    def update_many(self, samples):
+        """Feed a batch of samples, returns the output after the last one."""
+        out = self.out
+        for x in samples:
+            out = self.update(x)
+        return out
+
+
+class TofTrackingFilter:
+    """Constant velocity Kalman filter for the distance to a rising surface.
+
+    Tracks distance and its rate of change, so growth speed comes out of the
+    filter instead of differencing noisy readings. Every sample is weighted
+    by its own measurement variance, taken from the sensor's sigma estimate
+    and range status, so clean samples move the estimate more than doubtful
+    ones and invalid ones are ignored. Since the filter integrates over time
+    it needs fewer raw samples per update than plain averaging.
+
+    accel_noise: process noise, mm^2/s^3. How quickly the rise rate may
+        change, the default suits dough rising over hours.
+    sigma_mm: measurement sigma used when the sensor does not report one.
+    warning_scale: variance multiplier for samples with a warning status.
+    gate: samples further than `gate` standard deviations from the prediction
+        are rejected as outliers, `max_rejects` rejections in a row reset the
+        filter (the jar was moved or swapped).
+    """
+
+    def __init__(
+        self,
+        accel_noise=1e-8,
+        sigma_mm=5.0,
+        warning_scale=4.0,
+        gate=4.0,
+        max_rejects=3,
+    ):
+        self.q = accel_noise
+        self.sigma = sigma_mm
+        self.warning_scale = warning_scale
+        self.gate2 = gate * gate
+        self.max_rejects = max_rejects
+        self.reset()
+
+    def reset(self):
+        self.distance = None  # mm
+        self.velocity = 0.0  # mm/s, negative while the surface rises
+        # Covariance
+        self._p00 = self._p01 = self._p11 = 0.0
+        self._t = None
+        self._rejects = 0
+
+    @property
+    def rise_rate(self):
+        """Rise rate of the surface in mm/h."""
+        return -self.velocity * 3600
+
+    @property
+    def std_mm(self):
+        """Standard deviation of the distance estimate."""
+        return self._p00**0.5
+
+    def update(self, z_mm, sigma_mm=None, status=STATUS_VALID, t_ms=None):
+        """Feed a sample, returns the filtered distance."""
+        if status == STATUS_INVALID:
+            return self.distance
+        if t_ms is None:
+            t_ms = time.ticks_ms()
+
+        if not sigma_mm:
+            sigma_mm = self.sigma
+        r = sigma_mm * sigma_mm
+        if status == STATUS_WARNING:
+            r *= self.warning_scale
+
+        if self.distance is None:
+            self.distance = float(z_mm)
+            self.velocity = 0.0
+            self._p00 = r
+            self._p01 = 0.0
+            # Allow the rate to start anywhere within +-1 mm/s
+            self._p11 = 1.0
+            self._t = t_ms
+            return self.distance
+
+        # Predict
+        dt = time.ticks_diff(t_ms, self._t) / 1000
+        if dt > 0:
+            self._t = t_ms
+            q = self.q
+            p11 = self._p11
+            p01 = self._p01 + dt * p11
+            self.distance += dt * self.velocity
+            self._p00 += dt * (self._p01 + p01) + q * dt * dt * dt / 3
+            self._p01 = p01 + q * dt * dt / 2
+            self._p11 = p11 + q * dt
+
+        # Update
+        y = z_mm - self.distance
+        s = self._p00 + r
+        if y * y > self.gate2 * s:
+            self._rejects += 1
+            if self._rejects >= self.max_rejects:
+                self.reset()
+                return self.update(z_mm, sigma_mm, status, t_ms)
+            return self.distance
+        self._rejects = 0
+
+        k0 = self._p00 / s
+        k1 = self._p01 / s
+        self.distance += k0 * y
+        self.velocity += k1 * y
+        p00 = self._p00
+        p01 = self._p01
+        self._p00 = (1 - k0) * p00
+        self._p01 = (1 - k0) * p01
+        self._p11 -= k1 * p01
+        return self.distance
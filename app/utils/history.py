@@ -0,0 +1,87 @@
+from array import array
+
+# Result of MinMaxHistory.add
+UPDATED = 0  # The newest column changed
+APPENDED = 1  # A column was added at the end
+SCROLLED = 2  # A column was added and the oldest one dropped
+COMPACTED = 3  # Columns were merged, every column changed
+
+
+class MinMaxHistory:
+    """Fixed size history of min/max columns for plotting.
+
+    Every column summarises `bin_size` samples by their min and max, so
+    spikes stay visible however many samples a column holds. Resolution
+    adapts to the run length: while the history fills up, pairs of columns
+    are merged (doubling `bin_size`) until a column covers `max_bin` samples.
+    From then on the oldest column is dropped for each new one, keeping a
+    rolling window of `columns * max_bin` samples.
+    """
+
+    def __init__(self, columns, max_bin=1):
+        self.columns = columns - columns % 2  # Pairs merge evenly
+        self.max_bin = max_bin
+        self.bin_size = 1
+        self.mins = array("f", [0] * self.columns)
+        self.maxs = array("f", [0] * self.columns)
+        self.start = 0  # Ring index of the oldest column
+        self.count = 0
+        self._fill = 0  # Samples in the newest column
+
+    def __len__(self):
+        return self.count
+
+    def column(self, i):
+        """Return (min, max) of column i, 0 being the oldest."""
+        i = (self.start + i) % self.columns
+        return self.mins[i], self.maxs[i]
+
+    def add(self, value):
+        if self._fill:
+            i = (self.start + self.count - 1) % self.columns
+            if value < self.mins[i]:
+                self.mins[i] = value
+            if value > self.maxs[i]:
+                self.maxs[i] = value
+            self._advance()
+            return UPDATED
+
+        result = APPENDED
+        if self.count == self.columns:
+            if self.bin_size < self.max_bin:
+                self._compact()
+                result = COMPACTED
+            else:
+                self.start = (self.start + 1) % self.columns
+                self.count -= 1
+                result = SCROLLED
+        i = (self.start + self.count) % self.columns
+        self.mins[i] = value
+        self.maxs[i] = value
+        self.count += 1
+        self._advance()
+        return result
+
+    def _advance(self):
+        self._fill += 1
+        if self._fill >= self.bin_size:
+            self._fill = 0
+
+    def _compact(self):
+        # The ring is full so every column holds bin_size samples
+        mins = self.mins
+        maxs = self.maxs
+        half = self.columns // 2
+        merged_min = array("f", [0] * half)
+        merged_max = array("f", [0] * half)
+        for j in range(half):
+            a, b = self.column(2 * j)
+            c, d = self.column(2 * j + 1)
+            merged_min[j] = a if a < c else c
+            merged_max[j] = b if b > d else d
+        for j in range(half):
+            mins[j] = merged_min[j]
+            maxs[j] = merged_max[j]
+        self.start = 0
+        self.count = half
+        self.bin_size *= 2
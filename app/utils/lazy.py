@@ -0,0 +1,34 @@
+import gc
+import time
+
+from app.utils import boot
+
+
+def load(package, attrs, namespace, attr):
+    """Lazy loader for package `__getattr__`, effectively does:
+        global attr
+        from attrs[attr] import attr
+    and records how long the import took and the heap it used.
+
+    Names not in `attrs` are tried as submodules of the package. MicroPython
+    asks `__getattr__` first on `from package import module`, and an
+    AttributeError from it would fail the import."""
+    mod = attrs.get(attr, None)
+    allocated = gc.mem_alloc()
+    start = time.ticks_ms()
+    if mod is None:
+        mod = package + "." + attr
+        try:
+            value = __import__(mod, None, None, (attr,), 0)
+        except ImportError as e:
+            # Only the submodule itself missing means there is no such name,
+            # an import failing inside it is a real error.
+            if "'" + mod + "'" not in str(e):
+                raise
+            raise AttributeError(attr)
+    else:
+        value = getattr(__import__(mod, None, None, (attr,), 0), attr)
+    elapsed = time.ticks_diff(time.ticks_ms(), start)
+    boot.imported(mod, elapsed, gc.mem_alloc() - allocated)
+    namespace[attr] = value
+    return value
@@ -0,0 +1,16 @@
+from lib.gui.core.ugui import ssd
+from lib.gui.core.writer import Writer
+
+# One Writer per font, shared by every screen. Writer state (text position)
+# is kept per device anyway and colors are reset after each print, so
+# screens can share them freely.
+_writers = {}
+
+
+def get_writer(font):
+    """Return the shared Writer for a font module, creating it on first use."""
+    writer = _writers.get(font)
+    if writer is None:
+        writer = Writer(ssd, font, verbose=False)
+        _writers[font] = writer
+    return writer
@@ -28,11 +28,13 @@ class MessageBox(Window):
         width = ssd.width - 4
         row = 4
         col = 4
-        super().__init__(row, col, height, width, writer=writer)
+        # The popup covers the parent screen: restore it on close instead
+        # of redrawing every widget.
+        super().__init__(row, col, height, width, writer=writer, backing=True)
 
         row = ssd.height // 2 - writer.height // 2
         col = ssd.width // 2 - writer.stringlen(message) // 2
-        Label(writer, row, col, message)
+        Label(writer, row, col, message, cache=True)
 
         if closebutton:
             CloseButton(writer, callback=self.back_callback)
@@ -0,0 +1,78 @@
+import framebuf
+
+from app.utils.history import MinMaxHistory, UPDATED, APPENDED, SCROLLED
+from lib.gui.core.ugui import Widget, ssd
+
+
+class Sparkline(Widget):
+    """Small min/max plot of a value over time, one column per history bin.
+
+    The plot lives in its own FrameBuffer. A new sample only touches one
+    column: the buffer is scrolled when the window is full, so an update
+    costs the same with 10 or 10000 samples behind it. The whole plot is
+    redrawn only when the history is compacted or a value falls outside the
+    current range, which then grows to fit it.
+    """
+
+    def __init__(
+        self,
+        writer,
+        row,
+        col,
+        width,
+        height,
+        lo=0,
+        hi=100,
+        max_bin=1,
+        fgcolor=None,
+        bgcolor=None,
+        bdcolor=False,
+    ):
+        super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor)
+        self.lo = lo
+        self.hi = hi
+        self.history = MinMaxHistory(width, max_bin)
+        size = width * ((height + 7) >> 3)
+        self._fb = framebuf.FrameBuffer(bytearray(size), width, height, framebuf.MONO_VLSB)
+
+    def add(self, value):
+        if value < self.lo or value > self.hi:
+            self.lo = min(self.lo, value)
+            self.hi = max(self.hi, value)
+            self.history.add(value)
+            self._redraw()
+        else:
+            result = self.history.add(value)
+            x = len(self.history) - 1
+            if result == SCROLLED:
+                self._fb.scroll(-1, 0)
+                self._plot(x)
+            elif result == UPDATED or result == APPENDED:
+                self._plot(x)
+            else:  # Compacted
+                self._redraw()
+        self.draw = True
+
+    def _y(self, value):
+        h = self.height - 1
+        return h - round((value - self.lo) * h / (self.hi - self.lo))
+
+    def _plot(self, x):
+        lo, hi = self.history.column(x)
+        fb = self._fb
+        fb.vline(x, 0, self.height, 0)
+        y0 = self._y(hi)
+        fb.vline(x, y0, self._y(lo) - y0 + 1, 1)
+
+    def _redraw(self):
+        self._fb.fill(0)
+        for x in range(len(self.history)):
+            self._plot(x)
+
+    def show(self):
+        if not super().show(True):
+            return
+        palette = ssd.palette
+        palette.bg(self.bgcolor)
+        palette.fg(self.fgcolor)
+        ssd.blit(self._fb, self.col, self.row, -1, palette)
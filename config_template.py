@@ -10,3 +10,31 @@ TABLE_FEEDINGS_PROGRESS = ""
 TABLE_JARS = ""
 
 SPLASH_DELAY = 1
+
+# SCD4X power policy. Upload intervals (LIVE_UPDATE_DELAY) shorter than the
+# first value use periodic mode, shorter than the second low power periodic
+# mode, anything longer uses single shot measurements.
+SCD4X_LOW_POWER_INTERVAL = 30
+SCD4X_SINGLE_SHOT_INTERVAL = 90
+# Ambient pressure in hPa for CO2 compensation, 0 to disable.
+SCD4X_AMBIENT_PRESSURE = 0
+
+# ToF sensor array. Leave empty for a single sensor on the default address,
+# otherwise list the XSHUT pin of every sensor, one per jar.
+TOF_XSHUT_PINS = []
+TOF_BASE_ADDRESS = 0x30
+# Track each jar with a Kalman filter weighting readings by the sensor's
+# sigma. It also yields the rise rate, and since it integrates over time
+# TOF_SAMPLES can be lowered, keeping the sensors on for less time.
+TOF_TRACKING = False
+# Averaging stops before TOF_SAMPLES once the standard error of the mean
+# distance drops below this many mm.
+TOF_TARGET_ERROR_MM = 0.5
+# Tune the timing budget and sample count of each jar when it is measured,
+# the cheapest pair reaching TOF_TARGET_ERROR_MM is stored with the jar.
+# Needs "timing_budget" and "samples" number fields in the jars table, and
+# "jar_timing_budget"/"jar_samples" lookups in the feedings table.
+TOF_AUTO_TUNE = False
+
+# Number of screen instances kept for reuse when navigating.
+SCREEN_CACHE_SIZE = 3
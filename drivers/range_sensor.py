@@ -0,0 +1,411 @@
+"""
+Common interface for the distance sensors supported by the project.
+
+Each driver exposes ranging in its own way (properties vs methods, microseconds vs
+milliseconds, blocking vs polled reads, status codes). The adapters below wrap a driver
+instance and present the same small API to the rest of the application:
+
+    sensor.set_budget(50)       # Timing budget in ms, only touches the sensor if changed
+    sensor.start()
+    mm = await sensor.read_mm()
+    samples = await sensor.read_many(8)
+    sensor.status, sensor.sigma_mm, sensor.signal_rate
+    mm, stats = await sensor.read_average(20, target_error_mm=0.5)
+
+Reads never block the event loop while the sensor is ranging, they poll `ready()` and
+yield in between.
+"""
+
+import asyncio
+import time
+
+from micropython import const
+
+from drivers.vl53l4cd import (
+    RANGE_VALID,
+    RANGE_WARN_NO_WRAP_AROUND_CHECK,
+    RANGE_WARN_SIGMA_ABOVE,
+    RANGE_WARN_SIGMA_BELOW,
+)
+
+STATUS_VALID = const(0)
+STATUS_WARNING = const(1)
+STATUS_INVALID = const(2)
+
+STATUS_NAMES = ("valid", "warning", "invalid")
+
+_POLL_MS = const(1)
+# Slack on top of twice the budget before a sensor counts as not responding
+_TIMEOUT_MARGIN_MS = const(100)
+# Sigma floor, the VL53L4CD reports 0 for very clean readings
+_MIN_SIGMA_MM = 1.0
+
+
+class QualityAverage:
+    """Average of readings weighted by their quality.
+
+    Invalid readings, and readings beyond the optional sigma and signal rate
+    limits, are rejected. Accepted readings are weighted by 1/sigma^2 when the
+    sensor estimates sigma, warnings weigh `warning_scale` times less. The
+    standard error of the mean tells the caller when it has enough samples.
+    """
+
+    def __init__(self, max_sigma_mm=None, min_signal_rate=None, warning_scale=4.0):
+        self.max_sigma_mm = max_sigma_mm
+        self.min_signal_rate = min_signal_rate
+        self.warning_scale = warning_scale
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.rejected = 0
+        self._sw = 0.0  # Sum of weights
+        self._sw2 = 0.0  # Sum of squared weights
+        self._swx = 0.0
+        self._swx2 = 0.0
+        self._sigma_weights = False
+
+    def add(self, sensor):
+        """Add the last reading of `sensor`, returns False if rejected."""
+        sigma = sensor.sigma_mm
+        signal_rate = sensor.signal_rate
+        if (
+            sensor.status == STATUS_INVALID
+            or (sigma is not None and self.max_sigma_mm is not None and sigma > self.max_sigma_mm)
+            or (
+                signal_rate is not None
+                and self.min_signal_rate is not None
+                and signal_rate < self.min_signal_rate
+            )
+        ):
+            self.rejected += 1
+            return False
+
+        if sigma is None:
+            w = 1.0
+        else:
+            sigma = max(sigma, _MIN_SIGMA_MM)
+            w = 1 / (sigma * sigma)
+        if sensor.status == STATUS_WARNING:
+            w /= self.warning_scale
+        x = sensor.distance
+        self.count += 1
+        self._sw += w
+        self._sw2 += w * w
+        self._swx += w * x
+        self._swx2 += w * x * x
+        self._sigma_weights = sigma is not None
+        return True
+
+    @property
+    def mean(self):
+        return self._swx / self._sw if self.count else None
+
+    @property
+    def effective_count(self):
+        """Number of equally weighted samples giving the same precision."""
+        return self._sw * self._sw / self._sw2 if self.count else 0
+
+    @property
+    def std_error(self):
+        """Standard error of the mean in mm, None until it can be estimated."""
+        if self.count < 2:
+            return None
+        mean = self._swx / self._sw
+        variance = max(self._swx2 / self._sw - mean * mean, 0)
+        error = (variance / self.effective_count) ** 0.5
+        if self._sigma_weights:
+            # Never trust the scatter of a few samples more than the sensor
+            error = max(error, (1 / self._sw) ** 0.5)
+        return error
+
+    def done(self, target_error_mm, min_count=3):
+        error = self.std_error
+        return self.count >= min_count and error is not None and error <= target_error_mm
+
+
+class RangeSensor:
+    """Base adapter. Subclasses fill in the capability attributes and the
+    `_start`, `_stop`, `_set_budget`, `ready` and `_read` hooks."""
+
+    NAME = "range"
+    MIN_RANGE_MM = 0
+    MAX_RANGE_MM = 0
+    MIN_BUDGET_MS = 0
+    MAX_BUDGET_MS = 0
+    DEFAULT_BUDGET_MS = 0
+    HAS_SIGMA = False
+    HAS_SIGNAL_RATE = False
+
+    def __init__(self, sensor):
+        self.sensor = sensor
+        self.budget_ms = self.DEFAULT_BUDGET_MS
+        self.running = False
+        # Last measurement
+        self.distance = 0
+        self.status = STATUS_INVALID
+        self.raw_status = None
+        self.sigma_mm = None
+        self.signal_rate = None
+
+    def capabilities(self):
+        return {
+            "name": self.NAME,
+            "range_mm": (self.MIN_RANGE_MM, self.MAX_RANGE_MM),
+            "budget_ms": (self.MIN_BUDGET_MS, self.MAX_BUDGET_MS),
+            "sigma": self.HAS_SIGMA,
+            "signal_rate": self.HAS_SIGNAL_RATE,
+        }
+
+    def start(self):
+        if not self.running:
+            self._start()
+            self.running = True
+
+    def stop(self):
+        if self.running:
+            self._stop()
+            self.running = False
+
+    def set_budget(self, budget_ms):
+        """Set the timing budget in ms. Ranging is stopped and restarted only
+        when the budget actually changes."""
+        if not self.MIN_BUDGET_MS <= budget_ms <= self.MAX_BUDGET_MS:
+            raise ValueError(
+                f"{self.NAME} budget must be between {self.MIN_BUDGET_MS} and {self.MAX_BUDGET_MS} ms."
+            )
+        if budget_ms == self.budget_ms:
+            return
+        running = self.running
+        self.stop()
+        self._set_budget(budget_ms)
+        self.budget_ms = budget_ms
+        if running:
+            self.start()
+
+    @property
+    def timeout_ms(self):
+        """How long a measurement may take before the sensor is considered
+        stuck."""
+        return 2 * self.budget_ms + _TIMEOUT_MARGIN_MS
+
+    def ready(self):
+        """True if a measurement can be read without waiting."""
+        raise NotImplementedError
+
+    def read(self):
+        """Read the pending measurement, update the quality fields and return
+        the distance in mm. Only call after `ready()` returned True."""
+        self.distance = self._read()
+        return self.distance
+
+    async def read_mm(self, timeout_ms=None):
+        """Wait for the next measurement and read it. Raises OSError if none
+        is ready within `timeout_ms`, by default twice the budget plus some
+        slack (the `timeout_ms` property)."""
+        if timeout_ms is None:
+            timeout_ms = self.timeout_ms
+        start = time.ticks_ms()
+        while not self.ready():
+            if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+                raise OSError(f"{self.NAME} not ready after {timeout_ms} ms")
+            await asyncio.sleep_ms(_POLL_MS)
+        return self.read()
+
+    async def read_many(self, count, valid_only=False):
+        """Read `count` measurements. With `valid_only`, invalid readings are
+        discarded and do not count."""
+        samples = []
+        while len(samples) < count:
+            distance = await self.read_mm()
+            if valid_only and self.status == STATUS_INVALID:
+                continue
+            samples.append(distance)
+        return samples
+
+    async def read_average(
+        self, max_count, target_error_mm=None, min_count=3, average=None
+    ):
+        """Quality weighted average of up to `max_count` readings.
+
+        Stops early once the standard error reaches `target_error_mm`. At most
+        twice `max_count` readings are taken, so a sensor seeing nothing
+        cannot stall the caller. Returns the distance, or None if every
+        reading was rejected, and the `QualityAverage` with the statistics.
+        """
+        if average is None:
+            average = QualityAverage()
+        else:
+            average.reset()
+        for _ in range(2 * max_count):
+            await self.read_mm()
+            average.add(self)
+            if average.count >= max_count:
+                break
+            if target_error_mm is not None and average.done(target_error_mm, min_count):
+                break
+        return average.mean, average
+
+    def _start(self):
+        pass
+
+    def _stop(self):
+        pass
+
+    def _set_budget(self, budget_ms):
+        pass
+
+    def _read(self):
+        raise NotImplementedError
+
+
+class I2CRangeSensor(RangeSensor):
+    """Adapter for a sensor on the I2C bus, whose address can be changed so
+    several share the bus."""
+
+    def set_address(self, address):
+        self.sensor.set_address(address)
+
+
+_VL53L4CD_WARNINGS = (
+    RANGE_WARN_SIGMA_ABOVE,
+    RANGE_WARN_SIGMA_BELOW,
+    RANGE_WARN_NO_WRAP_AROUND_CHECK,
+)
+
+
+class VL53L4CDRange(I2CRangeSensor):
+    NAME = "VL53L4CD"
+    MIN_RANGE_MM = 1
+    MAX_RANGE_MM = 1300
+    MIN_BUDGET_MS = 10
+    MAX_BUDGET_MS = 200
+    DEFAULT_BUDGET_MS = 50
+    HAS_SIGMA = True
+    HAS_SIGNAL_RATE = True
+
+    def __init__(self, sensor):
+        super().__init__(sensor)
+        self._buffer = bytearray(15)
+        self.budget_ms = sensor.timing_budget
+
+    def _start(self):
+        self.sensor.start_ranging()
+
+    def _stop(self):
+        self.sensor.stop_ranging()
+
+    def _set_budget(self, budget_ms):
+        self.sensor.timing_budget = budget_ms
+
+    def ready(self):
+        return self.sensor.data_ready
+
+    def _read(self):
+        status, distance, sigma, signal_rate = self.sensor.read_result(self._buffer)
+        self.sensor.clear_interrupt()
+        self.raw_status = status
+        if status == RANGE_VALID:
+            self.status = STATUS_VALID
+        elif status in _VL53L4CD_WARNINGS:
+            self.status = STATUS_WARNING
+        else:
+            self.status = STATUS_INVALID
+        self.sigma_mm = sigma
+        self.signal_rate = signal_rate
+        return distance
+
+
+class VL53L0XRange(I2CRangeSensor):
+    NAME = "VL53L0X"
+    MIN_RANGE_MM = 30
+    MAX_RANGE_MM = 2000
+    MIN_BUDGET_MS = 20
+    MAX_BUDGET_MS = 2000
+    DEFAULT_BUDGET_MS = 33
+    # The sensor returns 8190/8191 when nothing is in range
+    _OUT_OF_RANGE = 8190
+
+    def __init__(self, sensor):
+        super().__init__(sensor)
+        self.budget_ms = sensor.measurement_timing_budget // 1000
+
+    def _start(self):
+        self.sensor.start_continuous()
+
+    def _stop(self):
+        self.sensor.stop_continuous()
+
+    def _set_budget(self, budget_ms):
+        self.sensor.measurement_timing_budget = budget_ms * 1000
+
+    def ready(self):
+        return self.sensor.data_ready
+
+    def _read(self):
+        distance = self.sensor.read_range()
+        self.raw_status = None
+        if distance >= self._OUT_OF_RANGE:
+            self.status = STATUS_INVALID
+        else:
+            self.status = STATUS_VALID
+        return distance
+
+
+class VL6180XRange(I2CRangeSensor):
+    """The VL6180X has no timing budget, the budget is mapped to the period of
+    continuous ranging."""
+
+    NAME = "VL6180X"
+    MIN_RANGE_MM = 0
+    MAX_RANGE_MM = 200
+    MIN_BUDGET_MS = 20
+    MAX_BUDGET_MS = 2550
+    DEFAULT_BUDGET_MS = 100
+
+    def _start(self):
+        self.sensor.start_range_continuous(self.budget_ms)
+
+    def _stop(self):
+        self.sensor.stop_range_continuous()
+
+    def ready(self):
+        return self.sensor.data_ready
+
+    def _read(self):
+        # Status first, reading the range clears the interrupt
+        self.raw_status = self.sensor.range_status
+        distance = self.sensor.range
+        self.status = STATUS_VALID if self.raw_status == 0 else STATUS_INVALID
+        return distance
+
+
+class HCSR04Range(RangeSensor):
+    """The HC-SR04 measures on demand. A measurement blocks for the echo, up to
+    the echo timeout, so `ready()` enforces a pause between pings instead."""
+
+    NAME = "HC-SR04"
+    MIN_RANGE_MM = 20
+    MAX_RANGE_MM = 4000
+    MIN_BUDGET_MS = 60
+    MAX_BUDGET_MS = 1000
+    DEFAULT_BUDGET_MS = 60
+
+    def __init__(self, sensor):
+        super().__init__(sensor)
+        self._last_ping = time.ticks_ms()
+
+    def ready(self):
+        return time.ticks_diff(time.ticks_ms(), self._last_ping) >= self.budget_ms
+
+    def _read(self):
+        try:
+            distance = self.sensor.distance_mm()
+        except OSError:
+            distance = 0
+        self._last_ping = time.ticks_ms()
+        if self.MIN_RANGE_MM <= distance <= self.MAX_RANGE_MM:
+            self.status = STATUS_VALID
+        else:
+            self.status = STATUS_INVALID
+        return distance
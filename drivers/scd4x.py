@@ -26,14 +26,16 @@ Implementation Notes
 * Adafruit's Bus Device library: https://github.com/adafruit/Adafruit_CircuitPython_BusDevice
 """
 
+import asyncio
 import struct
 import time
 
 from drivers import i2c_device
+from drivers.sensirion_crc import crc8, verify_words
 from micropython import const
 
 try:
-    from typing import Tuple, Union
+    from typing import Optional, Tuple, Union
 except ImportError:
     pass
 
@@ -69,6 +71,9 @@ class SCD4X:
 
     :param ~busio.I2C i2c_bus: The I2C bus the SCD4X is connected to.
     :param int address: The I2C device address for the sensor. Default is :const:`0x62`
+    :param bool stop: Stop periodic measurement on creation, blocking for 500ms.
+        Pass False and await :meth:`stop_periodic_measurement_async` instead to
+        keep the event loop running.
 
     **Quickstart: Importing and using the SCD4X**
 
@@ -100,18 +105,20 @@ class SCD4X:
 
     """
 
-    def __init__(self, i2c_bus: I2C, address: int = SCD4X_DEFAULT_ADDR) -> None:
+    def __init__(
+        self, i2c_bus: I2C, address: int = SCD4X_DEFAULT_ADDR, stop: bool = True
+    ) -> None:
         self.i2c_device = i2c_device.I2CDevice(i2c_bus, address)
         self._buffer = bytearray(18)
         self._cmd = bytearray(2)
-        self._crc_buffer = bytearray(2)
 
         # cached readings
         self._temperature = None
         self._relative_humidity = None
         self._co2 = None
 
-        self.stop_periodic_measurement()
+        if stop:
+            self.stop_periodic_measurement()
 
     @property
     def CO2(self) -> int:  # pylint:disable=invalid-name
@@ -214,6 +221,10 @@ class SCD4X:
         """Reads the temp/hum/co2 from the sensor and caches it"""
         self._send_command(_SCD4X_READMEASUREMENT, cmd_delay=0.001)
         self._read_reply(self._buffer, 9)
+        self._unpack_data()
+
+    def _unpack_data(self) -> None:
+        """Decodes a 9-byte measurement reply from the buffer into the cache"""
         # CO2 = word[0]
         self._co2 = (self._buffer[0] << 8) | self._buffer[1]
         temp = (self._buffer[3] << 8) | self._buffer[4]
@@ -329,15 +340,94 @@ class SCD4X:
             raise AttributeError("Height must be less than or equal to 65535 meters")
         self._set_command_value(_SCD4X_SETALTITUDE, height)
 
-    def _check_buffer_crc(self, buf: bytearray) -> bool:
-        for i in range(0, len(buf), 3):
-            self._crc_buffer[0] = buf[i]
-            self._crc_buffer[1] = buf[i + 1]
-            if self._crc8(self._crc_buffer) != buf[i + 2]:
-                raise RuntimeError("CRC check failed while reading data")
+    # Asyncio variants of the commands that have long execution times. These
+    # await the command delay instead of blocking so the event loop (GUI,
+    # buttons, other sensors) keeps running while the sensor is busy.
+
+    async def measure_single_shot_async(self) -> None:
+        """Awaitable :meth:`measure_single_shot`"""
+        await self._send_command_async(_SCD4X_MEASURESINGLESHOT, cmd_delay=5)
+
+    async def measure_single_shot_rht_only_async(self) -> None:
+        """Awaitable :meth:`measure_single_shot_rht_only`"""
+        await self._send_command_async(_SCD4X_MEASURESINGLESHOTRHTONLY, cmd_delay=0.05)
+
+    async def reinit_async(self) -> None:
+        """Awaitable :meth:`reinit`"""
+        await self.stop_periodic_measurement_async()
+        await self._send_command_async(_SCD4X_REINIT, cmd_delay=0.02)
+
+    async def factory_reset_async(self) -> None:
+        """Awaitable :meth:`factory_reset`"""
+        await self.stop_periodic_measurement_async()
+        await self._send_command_async(_SCD4X_FACTORYRESET, cmd_delay=1.2)
+
+    async def force_calibration_async(self, target_co2: int) -> None:
+        """Awaitable :meth:`force_calibration`"""
+        await self.stop_periodic_measurement_async()
+        await self._set_command_value_async(_SCD4X_FORCEDRECAL, target_co2, 0.5)
+        self._read_reply(self._buffer, 3)
+        correction = struct.unpack_from(">h", self._buffer[0:2])[0]
+        if correction == 0xFFFF:
+            raise RuntimeError(
+                "Forced recalibration failed.\
+            Make sure sensor is active for 3 minutes first"
+            )
+
+    async def self_test_async(self) -> None:
+        """Awaitable :meth:`self_test`, takes up to 10 seconds"""
+        await self.stop_periodic_measurement_async()
+        await self._send_command_async(_SCD4X_SELFTEST, cmd_delay=10)
+        self._read_reply(self._buffer, 3)
+        if (self._buffer[0] != 0) or (self._buffer[1] != 0):
+            raise RuntimeError("Self test failed")
+
+    async def stop_periodic_measurement_async(self) -> None:
+        """Awaitable :meth:`stop_periodic_measurement`"""
+        await self._send_command_async(_SCD4X_STOPPERIODICMEASUREMENT, cmd_delay=0.5)
+
+    async def start_periodic_measurement_async(self) -> None:
+        """Awaitable :meth:`start_periodic_measurement`"""
+        await self._send_command_async(_SCD4X_STARTPERIODICMEASUREMENT)
+
+    async def start_low_periodic_measurement_async(self) -> None:
+        """Awaitable :meth:`start_low_periodic_measurement`"""
+        await self._send_command_async(_SCD4X_STARTLOWPOWERPERIODICMEASUREMENT)
+
+    async def persist_settings_async(self) -> None:
+        """Awaitable :meth:`persist_settings`"""
+        await self._send_command_async(_SCD4X_PERSISTSETTINGS, cmd_delay=0.8)
+
+    async def read_if_ready(self) -> Optional[Tuple[int, float, float]]:
+        """Checks :attr:`data_ready` and, when a new measurement is available,
+        reads and caches it in the same operation.
+
+        :return: A ``(co2, temperature, relative_humidity)`` tuple, or ``None``
+            if no new measurement was available.
+        """
+        await self._send_command_async(_SCD4X_DATAREADY, cmd_delay=0.001)
+        self._read_reply(self._buffer, 3)
+        if (self._buffer[0] & 0x07 == 0) and (self._buffer[1] == 0):
+            return None
+        await self._send_command_async(_SCD4X_READMEASUREMENT, cmd_delay=0.001)
+        self._read_reply(self._buffer, 9)
+        self._unpack_data()
+        return self._co2, self._temperature, self._relative_humidity
+
+    def _check_buffer_crc(self, buf: bytearray, end: Optional[int] = None) -> bool:
+        if not verify_words(buf, end):
+            raise RuntimeError("CRC check failed while reading data")
         return True
 
     def _send_command(self, cmd: int, cmd_delay: float = 0) -> None:
+        self._write_command(cmd)
+        time.sleep(cmd_delay)
+
+    async def _send_command_async(self, cmd: int, cmd_delay: float = 0) -> None:
+        self._write_command(cmd)
+        await asyncio.sleep(cmd_delay)
+
+    def _write_command(self, cmd: int) -> None:
         self._cmd[0] = (cmd >> 8) & 0xFF
         self._cmd[1] = cmd & 0xFF
 
@@ -349,31 +439,29 @@ class SCD4X:
                 "Could not communicate via I2C, some commands/settings "
                 "unavailable while in working mode"
             ) from err
-        time.sleep(cmd_delay)
 
     def _set_command_value(self, cmd, value, cmd_delay=0):
+        self._write_command_value(cmd, value)
+        time.sleep(cmd_delay)
+
+    async def _set_command_value_async(self, cmd, value, cmd_delay=0):
+        self._write_command_value(cmd, value)
+        await asyncio.sleep(cmd_delay)
+
+    def _write_command_value(self, cmd, value):
         self._buffer[0] = (cmd >> 8) & 0xFF
         self._buffer[1] = cmd & 0xFF
-        self._crc_buffer[0] = self._buffer[2] = (value >> 8) & 0xFF
-        self._crc_buffer[1] = self._buffer[3] = value & 0xFF
-        self._buffer[4] = self._crc8(self._crc_buffer)
+        self._buffer[2] = (value >> 8) & 0xFF
+        self._buffer[3] = value & 0xFF
+        self._buffer[4] = crc8(self._buffer, 2, 4)
         with self.i2c_device as i2c:
             i2c.write(self._buffer, end=5)
-        time.sleep(cmd_delay)
 
     def _read_reply(self, buff, num):
         with self.i2c_device as i2c:
             i2c.readinto(buff, end=num)
-        self._check_buffer_crc(self._buffer[0:num])
+        self._check_buffer_crc(buff, num)
 
     @staticmethod
     def _crc8(buffer: bytearray) -> int:
-        crc = 0xFF
-        for byte in buffer:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x80:
-                    crc = (crc << 1) ^ 0x31
-                else:
-                    crc = crc << 1
-        return crc & 0xFF  # return the bottom 8 bits
+        return crc8(buffer)
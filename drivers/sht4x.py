@@ -32,6 +32,7 @@ import struct
 import time
 
 from drivers import i2c_device
+from drivers.sensirion_crc import crc8, verify_words
 from micropython import const
 
 try:
@@ -147,16 +148,12 @@ class SHT4x:
             time.sleep(0.01)
             i2c.readinto(self._buffer)
 
-        ser1 = self._buffer[0:2]
-        ser1_crc = self._buffer[2]
-        ser2 = self._buffer[3:5]
-        ser2_crc = self._buffer[5]
-
-        # check CRC of bytes
-        if ser1_crc != self._crc8(ser1) or ser2_crc != self._crc8(ser2):
+        # check CRC of both words
+        if not verify_words(self._buffer, 6):
             raise RuntimeError("Invalid CRC calculated")
 
-        serial = (ser1[0] << 24) + (ser1[1] << 16) + (ser2[0] << 8) + ser2[1]
+        buf = self._buffer
+        serial = (buf[0] << 24) + (buf[1] << 16) + (buf[3] << 8) + buf[4]
         return serial
 
     def reset(self) -> None:
@@ -201,26 +198,18 @@ class SHT4x:
             time.sleep(Mode.delay[self._mode])
             i2c.readinto(self._buffer)
 
-        # separate the read data
-        temp_data = self._buffer[0:2]
-        temp_crc = self._buffer[2]
-        humidity_data = self._buffer[3:5]
-        humidity_crc = self._buffer[5]
-
-        # check CRC of bytes
-        if temp_crc != self._crc8(temp_data) or humidity_crc != self._crc8(
-            humidity_data
-        ):
+        # check CRC of both words (temperature, humidity)
+        if not verify_words(self._buffer, 6):
             raise RuntimeError("Invalid CRC calculated")
 
         # decode data into human values:
         # convert bytes into 16-bit signed integer
         # convert the LSB value to a human value according to the datasheet
-        temperature = struct.unpack_from(">H", temp_data)[0]
+        temperature = struct.unpack_from(">H", self._buffer, 0)[0]
         temperature = -45.0 + 175.0 * temperature / 65535.0
 
         # repeat above steps for humidity data
-        humidity = struct.unpack_from(">H", humidity_data)[0]
+        humidity = struct.unpack_from(">H", self._buffer, 3)[0]
         humidity = -6.0 + 125.0 * humidity / 65535.0
         humidity = max(min(humidity, 100), 0)
 
@@ -233,12 +222,4 @@ class SHT4x:
     @staticmethod
     def _crc8(buffer) -> int:
         """verify the crc8 checksum"""
-        crc = 0xFF
-        for byte in buffer:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x80:
-                    crc = (crc << 1) ^ 0x31
-                else:
-                    crc = crc << 1
-        return crc & 0xFF  # return the bottom 8 bits
+        return crc8(buffer)
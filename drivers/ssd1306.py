@@ -1,5 +1,16 @@
 # MicroPython SSD1306 OLED driver, I2C and SPI interfaces
+#
+# show() only sends what changed since the previous frame. A copy of the last
+# frame sent is kept and each page is compared against it, the span of changed
+# columns in a page is sent through a SET_COL_ADDR/SET_PAGE_ADDR window. Idle
+# frames send nothing, which leaves the shared I2C bus to the sensors.
+#
+# do_refresh() is the asynchronous equivalent used by ugui: the frame is sent
+# in groups of pages, yielding (and releasing the user refresh lock when
+# lock_mode is set) between groups.
 
+import asyncio
+import micropython
 from micropython import const
 import framebuf
 from drivers.boolpalette import BoolPalette
@@ -24,6 +35,25 @@ SET_VCOM_DESEL = const(0xDB)
 SET_CHARGE_PUMP = const(0x8D)
 
 
+# Returns the changed column span of one page as (first << 16) | (last + 1),
+# or 0 when the page is clean. Changed bytes are copied to the shadow buffer.
+@micropython.viper
+def _dirty_span(buf: ptr8, shadow: ptr8, start: int, end: int) -> int:
+    first = -1
+    last = 0
+    i = start
+    while i < end:
+        if buf[i] != shadow[i]:
+            if first < 0:
+                first = i
+            last = i
+            shadow[i] = buf[i]
+        i += 1
+    if first < 0:
+        return 0
+    return ((first - start) << 16) | (last - start + 1)
+
+
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
 class SSD1306(framebuf.FrameBuffer):
@@ -37,7 +67,13 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
-        mode = framebuf.MONO_VLSB
+        self._mvb = memoryview(self.buffer)
+        self._shadow = bytearray(len(self.buffer))  # Last frame sent to the display
+        self._stale = True  # Display RAM unknown, next show() sends everything
+        self._window = bytearray(6)
+        self._lock = asyncio.Lock()  # Serialise asynchronous refreshes
+        self.lock_mode = True  # Release the user lock between groups of pages
+        self.mode = mode = framebuf.MONO_VLSB
         self.palette = BoolPalette(mode)  # Ensure color compatibility
         super().__init__(self.buffer, self.width, self.height, mode)
         self.init_display()
@@ -92,20 +128,80 @@ class SSD1306(framebuf.FrameBuffer):
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
+    def invalidate(self):
+        """Force the next refresh to send the whole frame."""
+        self._stale = True
+
     def show(self):
-        x0 = 0
-        x1 = self.width - 1
+        if self._stale:
+            self._show_full()
+        else:
+            self._show_pages(0, self.pages)
+
+    def _set_window(self, x0, x1, page0, page1):
         if self.width == 64:
             # displays with width of 64 pixels are shifted by 32
             x0 += 32
             x1 += 32
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        window = self._window
+        window[0] = SET_COL_ADDR
+        window[1] = x0
+        window[2] = x1
+        window[3] = SET_PAGE_ADDR
+        window[4] = page0
+        window[5] = page1
+        self.write_cmds(window)
+
+    def _show_full(self):
+        self._send_pages(0, self.pages)
+        self._stale = False
+
+    def _send_pages(self, page0, page1):
+        start = page0 * self.width
+        end = page1 * self.width
+        self._set_window(0, self.width - 1, page0, page1 - 1)
+        self.write_data(self._mvb[start:end])
+        self._shadow[start:end] = self._mvb[start:end]
+
+    async def do_refresh(self, split=8, elock=None):
+        """Asynchronous refresh in `split` parts. With `elock` the lock is only
+        held while a part is sent."""
+        if elock is None:
+            elock = asyncio.Lock()
+        async with self._lock:
+            step = max(self.pages // split, 1)
+            full = self._stale
+            self._stale = False
+            try:
+                for page in range(0, self.pages, step):
+                    async with elock:
+                        page1 = min(page + step, self.pages)
+                        if full:
+                            self._send_pages(page, page1)
+                        else:
+                            self._show_pages(page, page1)
+                    await asyncio.sleep_ms(0)
+            except Exception:
+                self._stale = True
+                raise
+
+    def _show_pages(self, page0, page1):
+        """Send the changed columns of pages page0 up to (excluding) page1."""
+        width = self.width
+        buf = self.buffer
+        shadow = self._shadow
+        try:
+            for page in range(page0, page1):
+                start = page * width
+                span = _dirty_span(buf, shadow, start, start + width)
+                if span:
+                    c0 = span >> 16
+                    c1 = span & 0xFFFF
+                    self._set_window(c0, c1 - 1, page, page)
+                    self.write_data(self._mvb[start + c0 : start + c1])
+        except Exception:
+            self._stale = True  # The shadow no longer matches the display
+            raise
 
 
 class SSD1306_I2C(SSD1306):
@@ -114,6 +210,7 @@ class SSD1306_I2C(SSD1306):
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
+        self.cmd_list = [b"\x00", None]  # Co=0, D/C#=0
         super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
@@ -121,6 +218,11 @@ class SSD1306_I2C(SSD1306):
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
+    def write_cmds(self, cmds):
+        # A single transaction, Co=0 so every following byte is a command
+        self.cmd_list[1] = cmds
+        self.i2c.writevto(self.addr, self.cmd_list)
+
     def write_data(self, buf):
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)
@@ -153,6 +255,14 @@ class SSD1306_SPI(SSD1306):
         self.spi.write(bytearray([cmd]))
         self.cs(1)
 
+    def write_cmds(self, cmds):
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs(1)
+        self.dc(0)
+        self.cs(0)
+        self.spi.write(cmds)
+        self.cs(1)
+
     def write_data(self, buf):
         self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.cs(1)
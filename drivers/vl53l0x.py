@@ -683,4 +683,4 @@ class VL53L0X:
             "SHDN" pin is pulled HIGH again the default I2C address is ``0x29``.
         """
         self._write_u8(_I2C_SLAVE_DEVICE_ADDRESS, new_address & 0x7F)
-        # self._device = i2c_device.I2CDevice(self._i2c, new_address)
+        self._device = i2c_device.I2CDevice(self._i2c, new_address)
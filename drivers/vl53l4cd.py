@@ -82,6 +82,41 @@ RANGE_ERROR_MERGED_TARGET = const(0x0B)
 RANGE_ERROR_SIGNAL_TOO_WEAK = const(0x0C)
 RANGE_ERROR_OTHER = const(0xFF)
 
+# Maps the raw RESULT_RANGE_STATUS value to the range status constants.
+_STATUS_RTN = (
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_HW_FAIL,
+    RANGE_WARN_SIGMA_BELOW,
+    RANGE_ERROR_INVALID_PHASE,
+    RANGE_WARN_SIGMA_ABOVE,
+    RANGE_ERROR_WRAPPED_TARGET_PHASE_MISMATCH,
+    RANGE_ERROR_DISTANCE_BELOW_DETECTION_THRESHOLD,
+    RANGE_VALID,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_CROSSTALK_FAIL,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_INTERRUPT,
+    RANGE_WARN_NO_WRAP_AROUND_CHECK,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_OTHER,
+    RANGE_ERROR_MERGED_TARGET,
+    RANGE_ERROR_SIGNAL_TOO_WEAK,
+)
+
+
+def _decode_status(status):
+    status &= 0x1F
+    if status < 24:
+        return _STATUS_RTN[status]
+    return RANGE_ERROR_OTHER
+
 
 class VL53L4CD:
     """Driver for the VL53L4CD distance sensor."""
@@ -219,40 +254,8 @@ class VL53L4CD:
     @property
     def range_status(self):
         """Measurement validity. If the range status is equal to 0, the distance is valid."""
-        status_rtn = [
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_HW_FAIL,
-            RANGE_WARN_SIGMA_BELOW,
-            RANGE_ERROR_INVALID_PHASE,
-            RANGE_WARN_SIGMA_ABOVE,
-            RANGE_ERROR_WRAPPED_TARGET_PHASE_MISMATCH,
-            RANGE_ERROR_DISTANCE_BELOW_DETECTION_THRESHOLD,
-            RANGE_VALID,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_CROSSTALK_FAIL,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_INTERRUPT,
-            RANGE_WARN_NO_WRAP_AROUND_CHECK,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_OTHER,
-            RANGE_ERROR_MERGED_TARGET,
-            RANGE_ERROR_SIGNAL_TOO_WEAK,
-        ]
         status = self._read_register(_VL53L4CD_RESULT_RANGE_STATUS, 1)
-        status = struct.unpack(">B", status)[0]
-        status = status & 0x1F
-        if status < 24:
-            status = status_rtn[status]
-        else:
-            status = RANGE_ERROR_OTHER
-        return status
+        return _decode_status(status[0])
 
     @property
     def sigma(self):
@@ -261,6 +264,30 @@ class VL53L4CD:
         sigma = struct.unpack(">H", sigma)[0]
         return sigma / 40
 
+    @property
+    def signal_rate(self):
+        """Return signal rate of the target in kcps."""
+        rate = self._read_register(_VL53L4CD_RESULT_SIGNAL_RATE, 2)
+        return struct.unpack(">H", rate)[0] * 8
+
+    def read_result(self, buf=None):
+        """
+        Reads the whole result block in a single I2C transaction instead of one
+        transaction per register. Returns a 4-tuple of range status, distance (mm),
+        sigma (mm) and signal rate (kcps).
+        """
+        # RESULT_RANGE_STATUS (0x89) up to the end of RESULT_DISTANCE (0x97)
+        if buf is None:
+            buf = bytearray(15)
+        with self.i2c_device as i2c:
+            i2c.write(struct.pack(">H", _VL53L4CD_RESULT_RANGE_STATUS))
+            i2c.readinto(buf)
+        status = _decode_status(buf[0])
+        signal_rate = ((buf[5] << 8) | buf[6]) * 8
+        sigma = ((buf[9] << 8) | buf[10]) / 4
+        distance = (buf[13] << 8) | buf[14]
+        return status, distance, sigma, signal_rate
+
     @property
     def timing_budget(self):
         """Ranging duration in milliseconds. Valid range is 10ms to 200ms."""
@@ -63,6 +63,7 @@ _VL6180X_REG_RESULT_INTERRUPT_STATUS_GPIO = const(0x04F)
 _VL6180X_REG_RESULT_ALS_VAL = const(0x050)
 _VL6180X_REG_RESULT_HISTORY_BUFFER_0 = const(0x052)
 _VL6180X_REG_RESULT_RANGE_VAL = const(0x062)
+_VL6180X_REG_I2C_SLAVE_DEVICE_ADDRESS = const(0x212)
 
 # Internal constants:
 _VL6180X_DEFAULT_I2C_ADDR = const(0x29)
@@ -316,6 +317,17 @@ class VL6180X:
         """
         return self._read_8(_VL6180X_REG_RESULT_RANGE_STATUS) >> 4
 
+    @property
+    def data_ready(self) -> bool:
+        """Check if a new range measurement is available without blocking."""
+        return bool(self._read_8(_VL6180X_REG_RESULT_INTERRUPT_STATUS_GPIO) & 0x04)
+
+    def set_address(self, new_address: int) -> None:
+        """Set a new I2C address. Other VL6180X sensors on the bus must be held
+        in shutdown while this is done."""
+        self._write_8(_VL6180X_REG_I2C_SLAVE_DEVICE_ADDRESS, new_address & 0x7F)
+        self._device = i2c_device.I2CDevice(self._device.i2c, new_address)
+
     def _load_settings(self) -> None:
         # private settings from page 24 of app note
         self._write_8(0x0207, 0x01)
@@ -1,3 +1,4 @@
+import asyncio
 import gc
 import sys
 from machine import Pin, I2C
@@ -5,8 +6,9 @@ import time
 import neopixel
 
 
+import config
 from app.services.log import LogServiceManager
-from app.utils import memory
+from app.utils import boot, memory
 
 # Create logger
 logger = LogServiceManager.get_logger(name=__name__)
@@ -24,6 +26,8 @@ from drivers.ssd1306 import SSD1306_I2C as SSD
 
 logger.info("Importing VL53L4CD driver...")
 from drivers.vl53l4cd import VL53L4CD
+from drivers.range_sensor import VL53L4CDRange
+from app.services.tof_array import TofArray
 
 logger.info("Importing SCD4X driver...")
 from drivers.scd4x import SCD4X
@@ -57,26 +61,79 @@ if ssd is None:
     logger.critical("Couldn't create SSD.")
     sys.exit()
 
-logger.info("Creating TOF sensor...")
+# Sensors are created by init_sensors(), awaited during boot so their start up
+# delays overlap WiFi and NTP. Screens read them from this module at use time.
+tof_array = None
+# First sensor of the array, used by screens measuring a single jar.
 tof_sensor = None
-retries = 3
-while not tof_sensor and retries > 0:
-    try:
-        tof_sensor = VL53L4CD(i2c_bus)
-    except Exception as e:
-        logger.error(f"({retries}) Error creating TOF sensor. {e}")
-        retries -= 1
-        time.sleep(1)
+sdc41 = None
+sht40 = None
+
+
+async def _create_tof_array():
+    if config.TOF_XSHUT_PINS:
+        # Several sensors on the bus, each gets its own address.
+        return await TofArray.boot(
+            i2c_bus,
+            config.TOF_XSHUT_PINS,
+            lambda i2c: VL53L4CDRange(VL53L4CD(i2c)),
+            config.TOF_BASE_ADDRESS,
+            config.TOF_TRACKING,
+        )
+    return TofArray([VL53L4CDRange(VL53L4CD(i2c_bus))], tracking=config.TOF_TRACKING)
+
+
+async def _retry(name, create, retries=3):
+    while True:
+        try:
+            return await create()
+        except Exception as e:
+            logger.error(f"({retries}) Error creating {name}. {e}")
+            retries -= 1
+            if retries == 0:
+                raise RuntimeError(f"Couldn't create {name}.")
+            await asyncio.sleep(1)
+
+
+async def _init_tof():
+    global tof_array, tof_sensor
+
+    logger.info("Creating TOF sensors...")
+    tof_array = await _retry("TOF sensor", _create_tof_array)
+    tof_sensor = tof_array.sensors[0]
+    boot.stage("ToF ready")
+
+
+async def _init_scd41():
+    global sdc41
+
+    async def create():
+        sensor = SCD4X(i2c_bus, stop=False)
+        # 500ms command delay, the other sensors come up meanwhile
+        await sensor.stop_periodic_measurement_async()
+        return sensor
+
+    logger.info("Creating SCD41 sensor...")
+    sdc41 = await _retry("SCD41 sensor", create)
+    boot.stage("CO2 ready")
+
+
+async def _init_sht40():
+    global sht40
+
+    async def create():
+        return SHT4x(i2c_bus)
+
+    logger.info("Creating SHT40 sensor...")
+    sht40 = await _retry("SHT40 sensor", create)
+    boot.stage("T/RH ready")
 
-if tof_sensor is None:
-    logger.critical("Couldn't create TOF sensor.")
-    sys.exit()
 
-logger.info("Creating SCD41 sensor...")
-sdc41 = SCD4X(i2c_bus)
+async def init_sensors():
+    """Bring up all sensors concurrently. Raises RuntimeError if one fails."""
+    await asyncio.gather(_init_scd41(), _init_tof(), _init_sht40())
+    memory.print_mem()
 
-logger.info("Creating SHT40 sensor...")
-sht40 = SHT4x(i2c_bus)
 
 logger.info("Creating button pins...")
 btn_nxt = Pin(41, Pin.IN, Pin.PULL_UP)
@@ -90,3 +147,4 @@ display = Display(ssd, btn_nxt, btn_sel, btn_prev, btn_inc, btn_dec)
 Screen.do_gc = False
 
 memory.print_mem()
+boot.stage("Display ready")
@@ -223,23 +223,32 @@ class DisplayIP:
         self.width = ssd.width
         self._is_grey = False  # Not greyed-out
 
+    # With cache=True the rendered text is kept for reuse (Writer.printcached).
     def print_centred(
-        self, writer, x, y, text, fgcolor=None, bgcolor=None, invert=False
+        self, writer, x, y, text, fgcolor=None, bgcolor=None, invert=False, cache=False
     ):
         sl = writer.stringlen(text)
         writer.set_textpos(ssd, y - writer.height // 2, x - sl // 2)
         if self._is_grey:
             fgcolor = color_map[GREY_OUT]
         writer.setcolor(fgcolor, bgcolor)
-        writer.printstring(text, invert)
+        if cache:
+            writer.printcached(text, invert)
+        else:
+            writer.printstring(text, invert)
         writer.setcolor()  # Restore defaults
 
-    def print_left(self, writer, x, y, txt, fgcolor=None, bgcolor=None, invert=False):
+    def print_left(
+        self, writer, x, y, txt, fgcolor=None, bgcolor=None, invert=False, cache=False
+    ):
         writer.set_textpos(ssd, y, x)
         if self._is_grey:
             fgcolor = color_map[GREY_OUT]
         writer.setcolor(fgcolor, bgcolor)
-        writer.printstring(txt, invert)
+        if cache:
+            writer.printcached(txt, invert)
+        else:
+            writer.printstring(txt, invert)
         writer.setcolor()  # Restore defaults
 
     # Greying out has only one option given limitation of 4-bit display driver
@@ -332,6 +341,15 @@ class Screen:
     is_shutdown = asyncio.Event()
     # The lock enables user code to synchronise refresh with a realtime process.
     rfsh_lock = asyncio.Lock()
+    # Set whenever the framebuf may have changed. The refresh task sleeps on it
+    # so a static screen costs neither CPU nor bus time.
+    rfsh_event = asyncio.Event()
+    max_fps = 20  # Refresh rate cap. 0 disables the cap.
+    # Refresh statistics
+    fps = 0  # Measured refreshes per second
+    rfsh_ms = 0  # Duration of the last refresh
+    rfsh_max_ms = 0  # Longest refresh
+    frames = 0  # Total refreshes
     BACK = 0
     STACK = 1
     REPLACE = 2
@@ -380,6 +398,12 @@ class Screen:
         if cls.current_screen is not None:
             return cls.current_screen.move_to(obj)
 
+    # User code drawing directly to the framebuf must call this to get it
+    # refreshed. Widgets do it automatically.
+    @classmethod
+    def wakeup(cls):
+        cls.rfsh_event.set()
+
     @classmethod
     def show(cls, force):
         for obj in cls.current_screen.displaylist:
@@ -419,8 +443,12 @@ class Screen:
                 ins_new = cls_new_screen(*args, **kwargs)
                 if not len(ins_new.lstactive):
                     raise ValueError("Screen has no active widgets.")
+            elif isinstance(cls_new_screen, Screen):  # Reuse an existing instance
+                if isinstance(ins_old, Window) or isinstance(cls_new_screen, Window):
+                    raise ValueError("Windows are modal.")
+                ins_new = cls_new_screen
             else:
-                raise ValueError("Must pass Screen class or subclass (not instance)")
+                raise ValueError("Must pass Screen class, subclass or instance")
             # REPLACE: parent of new screen is parent of current screen
             ins_new.parent = ins_old if mode == cls.STACK else ins_old.parent
         else:
@@ -429,6 +457,7 @@ class Screen:
         cls.current_screen = ins_new
         ins_new.on_open()  # Optional subclass method
         ins_new._do_open(ins_old)  # Clear and redraw
+        cls.rfsh_event.set()
         ins_new.after_open()  # Optional subclass method
         if ins_old is None and running:  # Initialising when asyncio already running
             asyncio.create_task(cls.monitor())
@@ -479,6 +508,8 @@ class Screen:
     # If the display driver has an async refresh method, determine the split
     # value which must be a factor of the height. In the unlikely event of
     # no factor, do_refresh confers no benefit, so use synchronous code.
+    # Refreshes only run after .rfsh_event is set and no more often than
+    # .max_fps allows.
     @classmethod
     async def auto_refresh(cls):
         arfsh = hasattr(ssd, "do_refresh")  # Refresh can be asynchronous.
@@ -491,8 +522,14 @@ class Screen:
             split = max(y for y in range(1, 9) if not h % y)
             if split == 1:
                 arfsh = False
+        t_fps = ticks_ms()
+        n_fps = 0
         while True:
+            await cls.rfsh_event.wait()  # Suspend until something changed
+            t_start = ticks_ms()
             Screen.show(False)  # Update stale controls. No physical refresh.
+            # Changes made from now on need another refresh.
+            cls.rfsh_event.clear()
             # Now perform physical refresh.
             # If there is no user locking, .rfsh_lock will be acquired immediately
             if (
@@ -510,7 +547,18 @@ class Screen:
                             await ssd.complete.wait()
                     else:
                         ssd.show()  # Synchronous (blocking) refresh.
-            await asyncio.sleep_ms(0)  # Let user code respond to lock release
+            t_end = ticks_ms()
+            dt = ticks_diff(t_end, t_start)
+            cls.rfsh_ms = dt
+            cls.rfsh_max_ms = max(cls.rfsh_max_ms, dt)
+            cls.frames += 1
+            n_fps += 1
+            if (t := ticks_diff(t_end, t_fps)) >= 1000:
+                cls.fps = n_fps * 1000 // t
+                t_fps = t_end
+                n_fps = 0
+            # Let user code respond to lock release. Hold off to cap the rate.
+            await asyncio.sleep_ms(max(1000 // cls.max_fps - dt, 0) if cls.max_fps else 0)
 
     @classmethod
     async def garbage_collect(cls):
@@ -565,8 +613,13 @@ class Screen:
 
     def _do_open(self, old_screen):  # Window overrides
         dev = display.usegrey(False)
-        # If opening a Screen from a Window just blank and redraw covered area
+        # If opening a Screen from a Window restore the area it covered: from
+        # the backing store if it kept one, otherwise blank the area and
+        # redraw the widgets it damaged. Widgets changed while covered have
+        # .draw set and are redrawn by the next refresh.
         if isinstance(old_screen, Window):
+            if old_screen.restore():
+                return
             x0, y0, x1, y1, w, h = old_screen._list_dims()
             dev.fill_rect(x0, y0, w, h, color_map[BG])  # Blank to screen BG
             for obj in [z for z in self.displaylist if z.overlaps(x0, y0, x1, y1)]:
@@ -671,6 +724,9 @@ class Screen:
 
 # Very basic window class. Cuts a rectangular hole in a screen on which
 # content may be drawn.
+# backing=True saves the framebuf under the window when it opens and copies it
+# back on close, so the parent's widgets need no redraw. Costs a buffer the
+# size of the window while it is open. Needs a driver exposing its .mode.
 class Window(Screen):
     @staticmethod
     def close():  # More intuitive name for popup window
@@ -687,6 +743,7 @@ class Window(Screen):
         bgcolor=None,
         fgcolor=None,
         writer=None,
+        backing=False,
     ):
         Screen.__init__(self, writer)
         self.row = row
@@ -694,17 +751,42 @@ class Window(Screen):
         self.height = height
         self.width = width
         self.draw_border = draw_border
+        self.backing = backing and hasattr(ssd, "mode")
+        self._store = None
         self.fgcolor = fgcolor if fgcolor is not None else color_map[FG]
         self.bgcolor = bgcolor if bgcolor is not None else color_map[BG]
 
     def _do_open(self, old_screen):
         dev = display.usegrey(False)
         x, y = self.col, self.row
+        if self.backing and self._store is None:  # Not when a child window closes
+            self.save()
         dev.fill_rect(x, y, self.width, self.height, self.bgcolor)
         if self.draw_border:
             dev.rect(x, y, self.width, self.height, self.fgcolor)
         Screen.show(True)
 
+    def save(self):
+        import framebuf
+
+        w, h = self.width, self.height
+        if ssd.mode == framebuf.MONO_VLSB:
+            size = w * ((h + 7) >> 3)
+        elif ssd.mode in (framebuf.MONO_HLSB, framebuf.MONO_HMSB):
+            size = ((w + 7) >> 3) * h
+        else:
+            return  # Color: too large to be worth it
+        self._store = framebuf.FrameBuffer(bytearray(size), w, h, ssd.mode)
+        self._store.blit(ssd, -self.col, -self.row)
+
+    # Copy the saved area back. Returns False if there was nothing saved.
+    def restore(self):
+        if self._store is None:
+            return False
+        ssd.blit(self._store, self.col, self.row)
+        self._store = None
+        return True
+
     def _list_dims(self):
         w = self.width
         h = self.height
@@ -757,7 +839,7 @@ class Widget:
         self.mrow = row + height + 2  # in subclass. Allow for border.
         self.mcol = col + width + 2
         self.visible = True  # Used by ButtonList class for invisible buttons
-        self.draw = True  # Signals that obect must be redrawn
+        self.draw = True  # Signals that obect must be redrawn. Wakes refresh.
         self._value = value
 
         # Set colors. Writer colors cannot be None:
@@ -801,6 +883,16 @@ class Widget:
     def __call__(self, val=None):
         return self.value(val)
 
+    @property
+    def draw(self):
+        return self._draw
+
+    @draw.setter
+    def draw(self, val):
+        self._draw = val
+        if val:
+            Screen.rfsh_event.set()
+
     # Some widgets (e.g. Dial) have an associated Label
     def text(self, text=None, invert=False, fgcolor=None, bgcolor=None, bdcolor=None):
         if hasattr(self, "label"):
@@ -816,6 +908,7 @@ class Widget:
             # Can occur if a control's action is to change screen.
             return False  # Subclass abandons
         self.draw = False
+        Screen.rfsh_event.set()  # May be drawn outside of a refresh (e.g. move)
         self.draw_border()
         # Blank controls' space
         if self.visible:
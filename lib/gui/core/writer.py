@@ -1,6 +1,8 @@
 # writer.py Implements the Writer class.
 # Handles colour, word wrap and tab stops
 
+# V0.5.4 Rendered string cache (printcached) for static and repeated text.
+# V0.5.3 Glyph FrameBuffer cache, strings that fit are blitted in one pass.
 # V0.5.2 May 2025 Fix bug whereby glyph clipping might be attempted.
 # V0.5.1 Dec 2022 Support 4-bit color display drivers.
 # V0.5.0 Sep 2021 Color now requires firmware >= 1.17.
@@ -25,7 +27,31 @@
 import framebuf
 from uctypes import bytearray_at, addressof
 
-__version__ = (0, 5, 2)
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ucollections import OrderedDict
+
+__version__ = (0, 5, 4)
+
+# Glyph FrameBuffers are cached per font, keyed on (char, invert). Normal
+# glyphs reference the font data in place, only inverted ones need a buffer.
+GLYPH_CACHE_SIZE = 64  # Glyphs per font
+_glyph_caches = {}
+
+
+def _glyph_cache(font):
+    if font not in _glyph_caches:
+        _glyph_caches[font] = OrderedDict()
+    return _glyph_caches[font]
+
+
+# Rendered strings used by printcached, keyed on (font, text, invert) so
+# writers sharing a font share entries. Least recently used strings are
+# evicted to keep the packed bitmaps within TEXT_CACHE_BYTES.
+TEXT_CACHE_BYTES = 2048
+_text_cache = OrderedDict()
+_text_cache_bytes = 0
 
 
 class DisplayState:
@@ -95,6 +121,7 @@ class Writer:
         self.glyph = None  # Current char
         self.char_height = 0
         self.char_width = 0
+        self._glyphs = _glyph_cache(font)
 
     def _getstate(self):
         return Writer.state[self.devid]
@@ -147,8 +174,11 @@ class Writer:
                 rstr = string[pos + 1 :]
                 string = lstr
 
-        for char in string:
-            self._printchar(char, invert)
+        if "\t" in string or not self._fits(string):
+            for char in string:
+                self._printchar(char, invert)
+        else:
+            self._blitstr(string, invert)
         if rstr is not None:
             self._printchar("\n")
             self._printline(rstr, invert)  # Recurse
@@ -227,6 +257,87 @@ class Writer:
         self.char_height = char_height
         self.char_width = char_width
 
+    # True if string fits on the current row without wrapping or clipping.
+    def _fits(self, string):
+        s = self._getstate()
+        return (
+            s.text_row + self.font.height() <= self.screenheight
+            and s.text_col + self.stringlen(string) <= self.screenwidth
+        )
+
+    # Return a (FrameBuffer, width) pair for a glyph, least recently used
+    # glyphs are evicted.
+    def _glyph_fb(self, char, invert):
+        cache = self._glyphs
+        key = ord(char) << 1 | (1 if invert else 0)
+        entry = cache.pop(key, None)
+        if entry is None:
+            glyph, char_height, char_width = self.font.get_ch(char)
+            if invert:
+                buf = bytearray(glyph)
+                for i, v in enumerate(buf):
+                    buf[i] = 0xFF & ~v
+            else:
+                buf = bytearray_at(addressof(glyph), len(glyph))
+            fbc = framebuf.FrameBuffer(buf, char_width, char_height, self.map)
+            entry = (fbc, char_width)
+            if len(cache) >= GLYPH_CACHE_SIZE:
+                cache.pop(next(iter(cache)))
+        cache[key] = entry
+        return entry
+
+    # Render a string known to fit on the current row.
+    def _blitstr(self, string, invert):
+        s = self._getstate()
+        blit = self.device.blit
+        row = s.text_row
+        col = s.text_col
+        for char in string:
+            fbc, char_width = self._glyph_fb(char, invert)
+            blit(fbc, col, row)
+            col += char_width
+        s.text_col = col
+        self.cpos += len(string)
+
+    # Return a (FrameBuffer, width, size) triple holding the whole string.
+    def _rendered(self, string, invert):
+        global _text_cache_bytes
+        key = (self.font, string, invert)
+        entry = _text_cache.pop(key, None)
+        if entry is None:
+            width = self.stringlen(string)
+            height = self.font.height()
+            size = ((width + 7) >> 3) * height
+            fbs = framebuf.FrameBuffer(bytearray(size), width, height, self.map)
+            col = 0
+            for char in string:
+                fbc, char_width = self._glyph_fb(char, invert)
+                fbs.blit(fbc, col, 0)
+                col += char_width
+            entry = (fbs, width, size)
+            if size > TEXT_CACHE_BYTES:
+                return entry  # Too large to cache
+            while _text_cache_bytes + size > TEXT_CACHE_BYTES:
+                _text_cache_bytes -= _text_cache.pop(next(iter(_text_cache)))[2]
+            _text_cache_bytes += size
+        _text_cache[key] = entry
+        return entry
+
+    def _blitcached(self, string, invert):
+        s = self._getstate()
+        fbs, width, _ = self._rendered(string, invert)
+        self.device.blit(fbs, s.text_col, s.text_row)
+        s.text_col += width
+        self.cpos += len(string)
+
+    # Like printstring, for text that is drawn repeatedly: a single line
+    # that fits is rendered once and then drawn with one blit.
+    def printcached(self, string, invert=False):
+        if not string or "\n" in string or "\t" in string or not self._fits(string):
+            self.printstring(string, invert)
+        else:
+            self._blitcached(string, invert)
+
     # Method using blitting. Efficient rendering for monochrome displays.
     # Tested on SSD1306. Invert is for black-on-white rendering.
     def _printchar(self, char, invert=False, recurse=False):
@@ -234,11 +345,7 @@ class Writer:
         self._get_char(char, recurse)
         if self.glyph is None:
             return  # All done
-        buf = bytearray(self.glyph)
-        if invert:
-            for i, v in enumerate(buf):
-                buf[i] = 0xFF & ~v
-        fbc = framebuf.FrameBuffer(buf, self.char_width, self.char_height, self.map)
+        fbc, _ = self._glyph_fb(char, invert)
         self.device.blit(fbc, s.text_col, s.text_row)
         s.text_col += self.char_width
         self.cpos += 1
@@ -278,16 +385,41 @@ class CWriter(Writer):
         self.def_bgcolor = self.bgcolor
         self.def_fgcolor = self.fgcolor
 
+    def _setpalette(self, invert):
+        palette = self.device.palette
+        palette.bg(self.fgcolor if invert else self.bgcolor)
+        palette.fg(self.bgcolor if invert else self.fgcolor)
+        return palette
+
+    # Colors come from the palette: only normal glyphs are cached.
+    def _blitstr(self, string, invert):
+        s = self._getstate()
+        blit = self.device.blit
+        palette = self._setpalette(invert)
+        row = s.text_row
+        col = s.text_col
+        for char in string:
+            fbc, char_width = self._glyph_fb(char, False)
+            blit(fbc, col, row, -1, palette)
+            col += char_width
+        s.text_col = col
+        self.cpos += len(string)
+
+    # Colors come from the palette: strings are cached in normal video.
+    def _blitcached(self, string, invert):
+        s = self._getstate()
+        fbs, width, _ = self._rendered(string, False)
+        self.device.blit(fbs, s.text_col, s.text_row, -1, self._setpalette(invert))
+        s.text_col += width
+        self.cpos += len(string)
+
     def _printchar(self, char, invert=False, recurse=False):
         s = self._getstate()
         self._get_char(char, recurse)
         if self.glyph is None:
             return  # All done
-        buf = bytearray_at(addressof(self.glyph), len(self.glyph))
-        fbc = framebuf.FrameBuffer(buf, self.char_width, self.char_height, self.map)
-        palette = self.device.palette
-        palette.bg(self.fgcolor if invert else self.bgcolor)
-        palette.fg(self.bgcolor if invert else self.fgcolor)
+        fbc, _ = self._glyph_fb(char, False)
+        palette = self._setpalette(invert)
         self.device.blit(fbc, s.text_col, s.text_row, -1, palette)
         s.text_col += self.char_width
         self.cpos += 1
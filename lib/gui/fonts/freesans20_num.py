@@ -0,0 +1,87 @@
+# Code generated by tools/font_subset.py from freesans20.py
+# Characters: ' %-0123456789m'
+version = '0.25'
+
+def height():
+    return 20
+
+def max_width():
+    return 18
+
+def hmap():
+    return True
+
+def reverse():
+    return False
+
+def monospaced():
+    return False
+
+def min_ch():
+    return 32
+
+def max_ch():
+    return 109
+
+_font =\
+b'\x0b\x00\x00\x00\x3c\x00\x7e\x00\xc7\x00\xc3\x00\x03\x00\x03\x00'\
+b'\x06\x00\x0c\x00\x08\x00\x18\x00\x18\x00\x00\x00\x00\x00\x18\x00'\
+b'\x18\x00\x00\x00\x00\x00\x00\x00\x00\x00\x05\x00\x00\x00\x00\x00'\
+b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
+b'\x12\x00\x00\x00\x00\x00\x00\x00\x38\x10\x00\x7c\x10\x00\xc6\x20'\
+b'\x00\xc6\x20\x00\xc6\x40\x00\x7c\xc0\x00\x38\x80\x00\x01\x1e\x00'\
+b'\x01\x3f\x00\x02\x73\x80\x02\x61\x80\x04\x73\x80\x04\x3f\x00\x08'\
+b'\x1e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x07\x00'\
+b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\xf8\xf8\x00\x00\x00\x00\x00'\
+b'\x00\x00\x00\x00\x0b\x00\x00\x00\x00\x00\x3e\x00\x7f\x00\x63\x00'\
+b'\xe3\x80\xc1\x80\xc1\x80\xc1\x80\xc1\x80\xc1\x80\xc1\x80\xe3\x80'\
+b'\x63\x00\x7f\x00\x3e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x0b\x00'\
+b'\x00\x00\x00\x00\x10\x00\x30\x00\xf0\x00\xf0\x00\x30\x00\x30\x00'\
+b'\x30\x00\x30\x00\x30\x00\x30\x00\x30\x00\x30\x00\x30\x00\x30\x00'\
+b'\x00\x00\x00\x00\x00\x00\x00\x00\x0b\x00\x00\x00\x00\x00\x3e\x00'\
+b'\x7f\x00\xe3\x80\xc1\x80\x01\x80\x01\x80\x03\x00\x0e\x00\x1c\x00'\
+b'\x30\x00\x60\x00\xc0\x00\xff\x80\xff\x80\x00\x00\x00\x00\x00\x00'\
+b'\x00\x00\x0b\x00\x00\x00\x00\x00\x3e\x00\x7f\x00\xe3\x80\xc1\x80'\
+b'\x01\x80\x0f\x00\x0f\x00\x03\x80\x01\x80\x01\x80\xc1\x80\xe3\x80'\
+b'\x7f\x00\x3e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x0b\x00\x00\x00'\
+b'\x00\x00\x06\x00\x06\x00\x0e\x00\x1e\x00\x16\x00\x26\x00\x46\x00'\
+b'\x46\x00\x86\x00\xff\x00\xff\x00\x06\x00\x06\x00\x06\x00\x00\x00'\
+b'\x00\x00\x00\x00\x00\x00\x0b\x00\x00\x00\x00\x00\x7f\x00\x7f\x00'\
+b'\x60\x00\x60\x00\xde\x00\xff\x00\xe3\x80\x01\x80\x01\x80\x01\x80'\
+b'\x01\x80\xc3\x00\x7f\x00\x3e\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
+b'\x0b\x00\x00\x00\x00\x00\x1e\x00\x3f\x00\x63\x00\x61\x80\xc0\x00'\
+b'\xde\x00\xff\x00\xe3\x80\xc1\x80\xc1\x80\xc1\x80\x63\x80\x7f\x00'\
+b'\x3e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x0b\x00\x00\x00\x00\x00'\
+b'\xff\x80\xff\x80\x01\x00\x03\x00\x02\x00\x06\x00\x04\x00\x0c\x00'\
+b'\x08\x00\x18\x00\x18\x00\x10\x00\x30\x00\x30\x00\x00\x00\x00\x00'\
+b'\x00\x00\x00\x00\x0b\x00\x00\x00\x00\x00\x1c\x00\x3e\x00\x63\x00'\
+b'\x63\x00\x63\x00\x3e\x00\x3e\x00\x63\x00\xc1\x80\xc1\x80\xc1\x80'\
+b'\x63\x00\x7f\x00\x1c\x00\x00\x00\x00\x00\x00\x00\x00\x00\x0b\x00'\
+b'\x00\x00\x00\x00\x3e\x00\x7f\x00\xe3\x00\xc1\x80\xc1\x80\xc1\x80'\
+b'\xe3\x80\x7f\x80\x3d\x80\x01\x80\x03\x00\xe3\x00\x7e\x00\x3c\x00'\
+b'\x00\x00\x00\x00\x00\x00\x00\x00\x10\x00\x00\x00\x00\x00\x00\x00'\
+b'\x00\x00\x00\x00\xde\x78\xfe\xfc\xe3\x8c\xc3\x0c\xc3\x0c\xc3\x0c'\
+b'\xc3\x0c\xc3\x0c\xc3\x0c\xc3\x0c\xc3\x0c\x00\x00\x00\x00\x00\x00'\
+b'\x00\x00'
+
+_index =\
+b'\x00\x00\x2a\x00\x40\x00\x7e\x00\x94\x00\xbe\x00\xe8\x00\x12\x01'\
+b'\x3c\x01\x66\x01\x90\x01\xba\x01\xe4\x01\x0e\x02\x38\x02\x62\x02'
+
+# Slot of each character from min_ch to max_ch, 0 (default glyph) if missing
+_map =\
+b'\x01\x00\x00\x00\x00\x02\x00\x00\x00\x00\x00\x00\x00\x03\x00\x00'\
+b'\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x00\x00\x00\x00\x00\x00'\
+b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
+b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
+b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x0e'
+
+_mvfont = memoryview(_font)
+
+def get_ch(ch):
+    i = ord(ch) - 32
+    slot = _map[i] if 0 <= i < 78 else 0
+    offset = int.from_bytes(_index[2 * slot : 2 * slot + 2], 'little')
+    next_offs = int.from_bytes(_index[2 * slot + 2 : 2 * slot + 4], 'little')
+    width = int.from_bytes(_font[offset:offset + 2], 'little')
+    return _mvfont[offset + 2:next_offs], 20, width
@@ -2,15 +2,40 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2022 Peter Hinch
 
-# Graphics are files created by Linux bitmap utility.
-# Widget writes data direct to the FrameBuffer.
+# Graphics are files created by Linux bitmap utility, or the precompiled
+# .mbm format produced from them (or from PNG) by tools/bitmap_convert.py.
 # There is no scaling: declared size of the widget must exactly
 # match the size of the bitmap.
 
+# The bitmap is loaded once into a FrameBuffer and drawn with a single blit.
+# Sources, fastest first:
+# - A module generated with tools/bitmap_convert.py --module. When frozen the
+#   data is used in place from flash.
+# - A .mbm file: an 8 byte header followed by the raw rows, read with one
+#   readinto.
+# - An .xbm file. Its data is MONO_HMSB as is, but the text must be parsed.
+
+import framebuf
+import struct
+from uctypes import bytearray_at, addressof
+
 from lib.gui.core.ugui import Widget
 from lib.gui.core.colors import *
 from lib.gui.core.ugui import ssd
 
+# .mbm header: magic, format, width, height
+MBM_MAGIC = b"MBM"
+MBM_HEADER = "<3sBHH"
+MBM_HEADER_SIZE = 8
+# Format byte to framebuf mode
+MBM_FORMATS = (framebuf.MONO_HMSB, framebuf.MONO_HLSB, framebuf.MONO_VLSB)
+
+
+def buffer_size(fmt, width, height):
+    if MBM_FORMATS[fmt] == framebuf.MONO_VLSB:
+        return width * ((height + 7) >> 3)
+    return ((width + 7) >> 3) * height
+
 
 class BitMap(Widget):
 
@@ -27,29 +52,17 @@ class BitMap(Widget):
         bdcolor=RED,
     ):
         super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor)
+        self._fb = None
 
     def show(self):
         if not super().show(True):  # Draw or erase border
             return
-        if self._value is None:
+        if self._fb is None:
             return
-        with open(self._value, "r") as f:
-            print("Drawing bitmap...")
-            g = self._gen_bytes(f)
-            bit = 1
-            wrap = False
-            for row in range(self.height):
-                if not wrap:
-                    byte = next(g)  # Each row starts on a new byte
-                    bit = 1
-                for col in range(self.width):
-                    c = self.fgcolor if byte & bit else self.bgcolor
-                    ssd.pixel(self.col + col, self.row + row, c)
-                    wrap = (bit := bit << 1) == 0x100
-                    if wrap:
-                        byte = next(g)
-                        bit = 1
-            print("Bitmap done!")
+        palette = ssd.palette
+        palette.bg(self.bgcolor)
+        palette.fg(self.fgcolor)
+        ssd.blit(self._fb, self.col, self.row, -1, palette)
 
     def _gen_bytes(self, f):  # Yield data bytes from file stream
         f.readline()
@@ -73,20 +86,51 @@ class BitMap(Widget):
             raise ValueError("Bad file format.")
         return int(elements[2])
 
-    def _validate(self, fn):
-        if not isinstance(fn, str):
-            raise ValueError("Value must be a filename.")
+    def _check_dims(self, wd, ht):
+        if not (wd == self.width and ht == self.height):
+            raise ValueError(
+                f"Object dimensions {ht}x{wd} do not match widget {self.height}x{self.width}"
+            )
+
+    def _load_xbm(self, fn):
         with open(fn, "r") as f:
             wd = self._get_dim(f, "width")
             ht = self._get_dim(f, "height")
-            if not (wd == self.width and ht == self.height):
-                raise ValueError(
-                    f"Object dimensions {ht}x{wd} do not match widget {self.height}x{self.width}"
-                )
+            self._check_dims(wd, ht)
+            buf = bytearray(buffer_size(0, wd, ht))
+            for i, byte in enumerate(self._gen_bytes(f)):
+                buf[i] = byte
+        return framebuf.FrameBuffer(buf, wd, ht, framebuf.MONO_HMSB)
+
+    def _load_mbm(self, fn):
+        with open(fn, "rb") as f:
+            magic, fmt, wd, ht = struct.unpack(MBM_HEADER, f.read(MBM_HEADER_SIZE))
+            if magic != MBM_MAGIC:
+                raise ValueError("Bad file format.")
+            self._check_dims(wd, ht)
+            buf = bytearray(buffer_size(fmt, wd, ht))
+            f.readinto(buf)
+        return framebuf.FrameBuffer(buf, wd, ht, MBM_FORMATS[fmt])
 
-    def value(self, fn):
-        self._validate(fn)  # Throws on failure
+    def _load_module(self, mod):
+        self._check_dims(mod.WIDTH, mod.HEIGHT)
+        data = mod.DATA
+        buf = bytearray_at(addressof(data), len(data))  # No copy
+        return framebuf.FrameBuffer(buf, mod.WIDTH, mod.HEIGHT, MBM_FORMATS[mod.FORMAT])
+
+    def value(self, fn):  # Throws on failure, keeping the current bitmap
+        if isinstance(fn, str):
+            if fn.endswith(".xbm"):
+                fb = self._load_xbm(fn)
+            else:
+                fb = self._load_mbm(fn)
+        elif hasattr(fn, "DATA"):
+            fb = self._load_module(fn)
+        else:
+            raise ValueError("Value must be a filename or bitmap module.")
+        self._fb = fb
         super().value(fn)
+        self.draw = True
 
     def color(self, fgcolor=None, bgcolor=None):
         if fgcolor is not None:
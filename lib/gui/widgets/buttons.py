@@ -10,6 +10,7 @@ from lib.gui.core.colors import *
 dolittle = lambda *_: None
 
 
+# Button text is static: it is drawn from the rendered text cache.
 class Button(Widget):
     lit_time = 1000
 
@@ -63,7 +64,13 @@ class Button(Widget):
             display.circle(x, y, self.radius, self.fgcolor)
             if len(self.text):
                 display.print_centred(
-                    self.writer, x, y, self.text, self.textcolor, self.bgcolor
+                    self.writer,
+                    x,
+                    y,
+                    self.text,
+                    self.textcolor,
+                    self.bgcolor,
+                    cache=True,
                 )
         else:
             xc = x + w // 2
@@ -73,14 +80,26 @@ class Button(Widget):
                 display.rect(x, y, w, h, self.fgcolor)
                 if len(self.text):
                     display.print_centred(
-                        self.writer, xc, yc, self.text, self.textcolor, self.bgcolor
+                        self.writer,
+                        xc,
+                        yc,
+                        self.text,
+                        self.textcolor,
+                        self.bgcolor,
+                        cache=True,
                     )
             elif self.shape == CLIPPED_RECT:  # clipped rectangle
                 display.fill_clip_rect(x, y, w, h, self.bgcolor)
                 display.clip_rect(x, y, w, h, self.fgcolor)
                 if len(self.text):
                     display.print_centred(
-                        self.writer, xc, yc, self.text, self.textcolor, self.bgcolor
+                        self.writer,
+                        xc,
+                        yc,
+                        self.text,
+                        self.textcolor,
+                        self.bgcolor,
+                        cache=True,
                     )
 
     async def shownormal(self):  # Revert to normal color after a delay
@@ -4,7 +4,7 @@
 # Copyright (c) 2021 Peter Hinch
 
 from hardware_setup import ssd, display  # Create a display instance
-from lib.gui.core.ugui import Widget
+from lib.gui.core.ugui import Screen, Widget
 from cmath import rect, pi
 from micropython import const
 from array import array
@@ -244,6 +244,7 @@ class CartesianGraph(Graph):
         xe = round(self.xp_origin + end[0] * self.x_axis_len)
         ye = round(self.yp_origin - end[1] * self.y_axis_len)
         ssd.line(xs, ys, xe, ye, color)
+        Screen.wakeup()  # Curves draw outside of a refresh
 
 
 class PolarGraph(Graph):
@@ -306,3 +307,4 @@ class PolarGraph(Graph):
         xe = round(self.xp_origin + end.real * height)
         ye = round(self.yp_origin - end.imag * height)
         ssd.line(xs, ys, xe, ye, color)
+        Screen.wakeup()  # Curves draw outside of a refresh
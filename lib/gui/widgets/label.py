@@ -8,6 +8,8 @@ from lib.gui.core.colors import *
 
 
 # text: str display string int save width
+# cache: keep the rendered text for labels that are static or cycle through a
+# few values. Not worth it for text that keeps changing (e.g. a clock).
 class Label(Widget):
     LEFT = 0
     CENTRE = 1
@@ -24,9 +26,11 @@ class Label(Widget):
         bgcolor=BLACK,
         bdcolor=False,
         justify=0,
+        cache=False,
     ):
         self.writer = writer
         self.justify = justify
+        self.cache = cache
         # Determine width of object
         if isinstance(text, int):
             width = text
@@ -90,4 +94,5 @@ class Label(Widget):
                 self.fgcolor,
                 self.bgcolor,
                 self.invert,
+                self.cache,
             )
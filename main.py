@@ -6,6 +6,7 @@ log.LogServiceManager.initialize(level=log.DEBUG, max_files=config.LOG_MAX_FILES
 
 import hardware_setup
 from app.screens.splash import SplashScreen
+from app.utils import boot
 from lib.gui.core.ugui import Screen
 
 logger = log.LogServiceManager.get_logger(name=__name__)
@@ -13,6 +14,7 @@ logger = log.LogServiceManager.get_logger(name=__name__)
 
 def main():
     logger.info("Starting app...")
+    boot.stage("App imported")
     Screen.change(SplashScreen)
 
 
@@ -1,3 +1,4 @@
+import asyncio
 import gc
 import config
 import urequests
@@ -6,10 +7,10 @@ from app.models.jar import JarModel
 from app.services.network import NetworkService
 
 
-def connect_wifi():
+async def connect_wifi():
     try:
         net_service = NetworkService()
-        net_service.connect()
+        await net_service.connect()
     except OSError as e:
         print(f"Connection error: {e}")
 
@@ -40,10 +41,14 @@ def create_jar(model):
         print(f"Error: {e}")
 
 
-gc.collect()
-print(f"Free RAM {gc.mem_free() / 1000}Kb")
-connect_wifi()
-print(f"Free RAM {gc.mem_free() / 1000}Kb")
-model = JarModel("myname", 123)
-create_jar(model)
-print(f"Free RAM {gc.mem_free() / 1000}Kb")
+async def main():
+    gc.collect()
+    print(f"Free RAM {gc.mem_free() / 1000}Kb")
+    await connect_wifi()
+    print(f"Free RAM {gc.mem_free() / 1000}Kb")
+    model = JarModel("myname", 123)
+    create_jar(model)
+    print(f"Free RAM {gc.mem_free() / 1000}Kb")
+
+
+asyncio.run(main())
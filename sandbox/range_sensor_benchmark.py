@@ -0,0 +1,63 @@
+import asyncio
+import time
+from machine import I2C, Pin
+
+from drivers.range_sensor import STATUS_NAMES, STATUS_VALID
+
+# Uncomment the sensor to benchmark
+from drivers.vl53l4cd import VL53L4CD
+from drivers.range_sensor import VL53L4CDRange as Adapter
+
+# from drivers.vl53l0x import VL53L0X
+# from drivers.range_sensor import VL53L0XRange as Adapter
+
+# from drivers.vl6180x import VL6180X
+# from drivers.range_sensor import VL6180XRange as Adapter
+
+# from drivers.hcsr04 import HCSR04
+# from drivers.range_sensor import HCSR04Range as Adapter
+
+SAMPLES = 20
+BUDGETS = (10, 20, 33, 50, 100, 200)
+
+print("Creating I2C bus...")
+i2c = I2C(0, sda=Pin(45), scl=Pin(47))
+
+print("Creating sensor...")
+sensor = Adapter(VL53L4CD(i2c))
+# sensor = Adapter(VL53L0X(i2c))
+# sensor = Adapter(VL6180X(i2c))
+# sensor = Adapter(HCSR04(trigger_pin=13, echo_pin=12))
+print(sensor.capabilities())
+
+
+async def benchmark(budget):
+    sensor.set_budget(budget)
+    sensor.start()
+    statuses = [0] * len(STATUS_NAMES)
+    samples = []
+    start = time.ticks_ms()
+    for _ in range(SAMPLES):
+        distance = await sensor.read_mm()
+        statuses[sensor.status] += 1
+        if sensor.status == STATUS_VALID:
+            samples.append(distance)
+    elapsed = time.ticks_diff(time.ticks_ms(), start)
+
+    spread = max(samples) - min(samples) if samples else 0
+    mean = sum(samples) / len(samples) if samples else 0
+    print(
+        f"{budget:4} ms: {elapsed / SAMPLES:6.1f} ms/sample mean: {mean:6.1f} mm "
+        f"spread: {spread:3} mm sigma: {sensor.sigma_mm} "
+        + " ".join(f"{n}: {c}" for n, c in zip(STATUS_NAMES, statuses))
+    )
+
+
+async def main():
+    for budget in BUDGETS:
+        if sensor.MIN_BUDGET_MS <= budget <= sensor.MAX_BUDGET_MS:
+            await benchmark(budget)
+    sensor.stop()
+
+
+asyncio.run(main())
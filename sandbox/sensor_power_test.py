@@ -0,0 +1,79 @@
+import asyncio
+
+from app.services.sensor_power import SensorPowerPolicy
+
+# Seconds between reads, the tracking screen reads every interval too
+INTERVAL = 0.2
+READS = 5
+
+
+class FakeSCD4X:
+    """Stands in for the SCD4X, a single shot takes SHOT_MS to measure."""
+
+    SHOT_MS = 50
+
+    def __init__(self):
+        self.temperature_offset = 4.0
+        self._ready = False
+        self.shots = 0
+
+    async def measure_single_shot_async(self):
+        await asyncio.sleep_ms(self.SHOT_MS)
+        self.shots += 1
+        self._ready = True
+
+    async def read_if_ready(self):
+        if not self._ready:
+            return None
+        self._ready = False
+        return (400 + self.shots, 22.0, 50.0)
+
+    async def start_periodic_measurement_async(self):
+        self._ready = True
+
+    async def start_low_periodic_measurement_async(self):
+        self._ready = True
+
+    async def stop_periodic_measurement_async(self):
+        pass
+
+
+async def single_shot():
+    scd4x = FakeSCD4X()
+    policy = SensorPowerPolicy(scd4x, interval=INTERVAL)
+    policy.mode = SensorPowerPolicy.MODE_SINGLE_SHOT
+    await policy.start()
+
+    readings = []
+    for _ in range(READS):
+        reading = await policy.read()
+        print(f"reading: {reading}")
+        if reading is not None:
+            readings.append(reading)
+        await asyncio.sleep(INTERVAL)
+    await policy.stop()
+
+    # Every read but the first returns the shot started by the one before
+    assert len(readings) == READS - 1, readings
+
+
+async def periodic():
+    scd4x = FakeSCD4X()
+    policy = SensorPowerPolicy(scd4x, interval=INTERVAL)
+    policy.mode = SensorPowerPolicy.MODE_PERIODIC
+    await policy.start()
+
+    # The SCD4X reads 22C where the reference reads 18C, 4C more self heating
+    policy.compensate(18.0)
+    assert await policy.read() is not None
+    await policy.stop()
+    assert scd4x.temperature_offset == 8.0, scd4x.temperature_offset
+
+
+async def main():
+    await single_shot()
+    await periodic()
+    print("OK")
+
+
+asyncio.run(main())
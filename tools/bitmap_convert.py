@@ -0,0 +1,115 @@
+"""
+Convert an XBM or PNG image to the .mbm bitmap format loaded by
+lib/gui/widgets/bitmap.BitMap, or to a Python module that can be frozen into
+the firmware so the bitmap is used in place from flash.
+
+    python tools/bitmap_convert.py fermento_logo.xbm
+    python tools/bitmap_convert.py logo.png --format vlsb --invert
+    python tools/bitmap_convert.py fermento_logo.xbm --module app/assets/logo.py
+
+A set bit is drawn in the widget's fgcolor. For PNG images dark pixels are set
+(as in XBM) unless --invert is given. PNG input needs Pillow.
+"""
+
+import argparse
+import re
+import struct
+from pathlib import Path
+
+# Must match lib/gui/widgets/bitmap.py
+MBM_MAGIC = b"MBM"
+MBM_HEADER = "<3sBHH"
+FORMATS = {"hmsb": 0, "hlsb": 1, "vlsb": 2}
+THRESHOLD = 128
+
+
+def read_xbm(path: Path):
+    """Return width, height and the image as rows of booleans."""
+    text = path.read_text()
+    width = int(re.search(r"_width\s+(\d+)", text).group(1))
+    height = int(re.search(r"_height\s+(\d+)", text).group(1))
+    data = [int(x, 16) for x in re.findall(r"0x[0-9a-fA-F]+", text.split("{", 1)[1])]
+    stride = (width + 7) // 8
+    rows = [
+        [bool(data[y * stride + x // 8] & (1 << (x % 8))) for x in range(width)]
+        for y in range(height)
+    ]
+    return width, height, rows
+
+
+def read_png(path: Path):
+    try:
+        from PIL import Image
+    except ImportError:
+        raise SystemExit("PNG input needs Pillow: pip install pillow")
+    image = Image.open(path).convert("L")
+    width, height = image.size
+    pixels = image.load()
+    rows = [[pixels[x, y] < THRESHOLD for x in range(width)] for y in range(height)]
+    return width, height, rows
+
+
+def pack(rows, width, height, fmt: str) -> bytes:
+    if fmt == "vlsb":
+        out = bytearray(width * ((height + 7) // 8))
+        for y in range(height):
+            for x in range(width):
+                if rows[y][x]:
+                    out[(y // 8) * width + x] |= 1 << (y % 8)
+        return bytes(out)
+
+    stride = (width + 7) // 8
+    out = bytearray(stride * height)
+    for y in range(height):
+        for x in range(width):
+            if rows[y][x]:
+                bit = x % 8 if fmt == "hmsb" else 7 - x % 8
+                out[y * stride + x // 8] |= 1 << bit
+    return bytes(out)
+
+
+def write_module(path: Path, width: int, height: int, fmt: str, data: bytes) -> None:
+    lines = [
+        "# Generated by tools/bitmap_convert.py. Freeze to keep DATA in flash.",
+        f"WIDTH = {width}",
+        f"HEIGHT = {height}",
+        f"FORMAT = {FORMATS[fmt]}  # {fmt.upper()}",
+        "DATA = (",
+    ]
+    for i in range(0, len(data), 16):
+        chunk = "".join(f"\\x{b:02x}" for b in data[i : i + 16])
+        lines.append(f'    b"{chunk}"')
+    lines.append(")")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("source", type=Path, help=".xbm or .png image")
+    parser.add_argument("-o", "--output", type=Path, help="Output .mbm file")
+    parser.add_argument("--module", type=Path, help="Write a Python module instead")
+    parser.add_argument("--format", choices=FORMATS, default="hmsb")
+    parser.add_argument("--invert", action="store_true", help="Swap set and clear")
+    args = parser.parse_args()
+
+    if args.source.suffix.lower() == ".xbm":
+        width, height, rows = read_xbm(args.source)
+    else:
+        width, height, rows = read_png(args.source)
+    if args.invert:
+        rows = [[not p for p in row] for row in rows]
+    data = pack(rows, width, height, args.format)
+
+    if args.module:
+        write_module(args.module, width, height, args.format, data)
+        print(f"{args.source} -> {args.module} ({width}x{height}, {len(data)} bytes)")
+        return
+
+    output = args.output or args.source.with_suffix(".mbm")
+    header = struct.pack(MBM_HEADER, MBM_MAGIC, FORMATS[args.format], width, height)
+    output.write_bytes(header + data)
+    print(f"{args.source} -> {output} ({width}x{height}, {len(data)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,12 +12,14 @@ def main():
         print(f"Error: directory not found: {ROOT}")
         sys.exit(1)
 
-    for py_file in ROOT.rglob("*.mpy"):
+    # Compiled modules and the gzipped web assets from compile.py
+    generated = list(ROOT.rglob("*.mpy")) + list((ROOT / "app").rglob("*.gz"))
+    for path in generated:
         try:
-            print(f"Deleting file {py_file}")
-            os.remove(py_file)
+            print(f"Deleting file {path}")
+            os.remove(path)
         except Exception as e:
-            print(f"❌ Failed deleting {py_file}")
+            print(f"❌ Failed deleting {path}")
             raise e
 
     print("✅ Cleaning complete")
@@ -1,3 +1,4 @@
+import gzip
 import subprocess
 from pathlib import Path
 import sys
@@ -20,6 +21,9 @@ EXCLUDE_DIRS = {
     "tools",
     "firmware",
 }
+# Static web assets, served gzipped by the captive portal
+STATIC_DIR = ROOT / "app" / "services" / "web"
+STATIC_EXTENSIONS = {".css", ".js", ".html"}
 # ------------------------
 
 
@@ -38,6 +42,17 @@ def compile_file(py_file: Path):
     )
 
 
+def compress_file(path: Path):
+    gz_file = path.with_name(path.name + ".gz")
+
+    print(f"Compressing {path} → {gz_file.name}")
+
+    # mtime=0 keeps the output identical between builds
+    with open(path, "rb") as src, open(gz_file, "wb") as dst:
+        with gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=9, mtime=0) as gz:
+            gz.write(src.read())
+
+
 def main():
     if not ROOT.exists():
         print(f"Error: directory not found: {ROOT}")
@@ -53,6 +68,10 @@ def main():
             print(f"❌ Failed compiling {py_file}")
             raise e
 
+    for path in STATIC_DIR.rglob("*"):
+        if path.suffix in STATIC_EXTENSIONS and not should_skip(path):
+            compress_file(path)
+
     print("✅ Compilation complete")
 
 
@@ -0,0 +1,117 @@
+"""
+Subset a font-to-py font module to the characters an app actually draws.
+
+    python tools/font_subset.py lib/gui/fonts/freesans20.py "0123456789%- m" \
+        -o lib/gui/fonts/freesans20_num.py
+
+The generated module has the same interface as the original (get_ch, height,
+max_width...) so it can be passed to Writer unchanged. Glyphs are looked up
+through a byte map indexed by character code, a single subscript for a
+sparse set. Characters not in the subset render as the font's default glyph.
+Generated modules are meant to be frozen into the firmware (see README).
+"""
+
+import argparse
+import runpy
+from pathlib import Path
+
+
+def load_font(path: Path) -> dict:
+    return runpy.run_path(str(path))
+
+
+def subset(font: dict, chars: str):
+    """Return the packed glyph data, offset index and char map."""
+    chars = "".join(sorted(set(chars)))
+    get_ch = font["get_ch"]
+    # Slot 0 holds the default glyph
+    glyphs = [get_ch("\x00")] + [get_ch(ch) for ch in chars]
+    data = bytearray()
+    offsets = []
+    max_width = 0
+    for glyph, _, width in glyphs:
+        offsets.append(len(data))
+        data += width.to_bytes(2, "little") + bytes(glyph)
+        max_width = max(max_width, width)
+    offsets.append(len(data))
+    index = b"".join(o.to_bytes(2, "little") for o in offsets)
+
+    min_ch = ord(chars[0])
+    max_ch = ord(chars[-1])
+    char_map = bytearray(max_ch - min_ch + 1)
+    for slot, ch in enumerate(chars, 1):
+        char_map[ord(ch) - min_ch] = slot
+    return chars, bytes(data), index, bytes(char_map), min_ch, max_ch, max_width
+
+
+def to_literal(name: str, data: bytes) -> str:
+    lines = [f"{name} =\\"]
+    for i in range(0, len(data), 16):
+        chunk = "".join(f"\\x{b:02x}" for b in data[i : i + 16])
+        lines.append(f"b'{chunk}'\\")
+    lines[-1] = lines[-1][:-1]
+    return "\n".join(lines)
+
+
+def render(source: Path, font: dict, chars: str) -> str:
+    chars, data, index, char_map, min_ch, max_ch, max_width = subset(font, chars)
+    height = font["height"]()
+    return f'''# Code generated by tools/font_subset.py from {source.name}
+# Characters: {chars!r}
+version = {font["version"]!r}
+
+def height():
+    return {height}
+
+def max_width():
+    return {max_width}
+
+def hmap():
+    return {font["hmap"]()}
+
+def reverse():
+    return {font["reverse"]()}
+
+def monospaced():
+    return {font["monospaced"]()}
+
+def min_ch():
+    return {min_ch}
+
+def max_ch():
+    return {max_ch}
+
+{to_literal("_font", data)}
+
+{to_literal("_index", index)}
+
+# Slot of each character from min_ch to max_ch, 0 (default glyph) if missing
+{to_literal("_map", char_map)}
+
+_mvfont = memoryview(_font)
+
+def get_ch(ch):
+    i = ord(ch) - {min_ch}
+    slot = _map[i] if 0 <= i < {len(char_map)} else 0
+    offset = int.from_bytes(_index[2 * slot : 2 * slot + 2], 'little')
+    next_offs = int.from_bytes(_index[2 * slot + 2 : 2 * slot + 4], 'little')
+    width = int.from_bytes(_font[offset:offset + 2], 'little')
+    return _mvfont[offset + 2:next_offs], {height}, width
+'''
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("font", type=Path, help="font-to-py module")
+    parser.add_argument("chars", help="Characters to keep")
+    parser.add_argument("-o", "--output", type=Path, help="Output module")
+    args = parser.parse_args()
+
+    font = load_font(args.font)
+    output = args.output or args.font.with_name(f"{args.font.stem}_subset.py")
+    output.write_text(render(args.font, font, args.chars))
+    print(f"{args.font} -> {output} ({len(set(args.chars))} characters)")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ EXCLUDE_DIRS = {
     "drivers",
 }
 
-INCLUDE_EXTENSIONS = {".mpy", ".css", ".xbm", ".dat"}
+INCLUDE_EXTENSIONS = {".mpy", ".css", ".gz", ".xbm", ".mbm", ".dat"}
 
 # (local relative path, remote path)
 FORCE_FILES = [("main.py", ":/main.py"), ("boot.py", ":/boot.py")]